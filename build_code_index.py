@@ -1,5 +1,6 @@
 """CLI script to build code index for a Python repository."""
 
+import os
 import sys
 import argparse
 from pathlib import Path
@@ -63,6 +64,13 @@ Examples:
         default=["**/*.py"],
         help="Glob patterns to include (default: **/*.py)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes for parsing (default: all cores; "
+        "pass 1 for serial)",
+    )
     parser.add_argument(
         "--exclude",
         type=str,
@@ -121,13 +129,33 @@ Examples:
     print("Indexing repository...")
     indexer = CodeIndexer(repo_name=args.repo, repo_root=repo_path)
 
-    # Index the repository
+    # Index the repository, storing objects as they are parsed: the sink
+    # flushes to the database in 5k chunks so storage overlaps parsing
+    # instead of materializing the whole repo before the first insert
+    pending = []
+
+    def store_chunk(objects):
+        pending.extend(objects)
+        if len(pending) >= 5000:
+            store.add_objects_batch(pending)
+            pending.clear()
+
     try:
         count = indexer.index_repository(
             include_patterns=args.include,
             exclude_patterns=args.exclude,
             include_private=args.include_private,
+            max_workers=args.workers,
+            sink=store_chunk,
+            # Objects land in the store via the sink; skipping the
+            # indexer's in-memory dicts halves peak RAM on large repos
+            in_memory=False,
         )
+        if pending:
+            store.add_objects_batch(pending)
+            pending.clear()
+        # One ANALYZE for the whole load, not one per flushed batch
+        store.finalize()
         print(f"  Found {count} code objects")
     except Exception as e:
         print(f"Error during indexing: {e}")
@@ -135,25 +163,18 @@ Examples:
 
     print()
 
-    # Get statistics from indexer
-    stats = indexer.get_stats()
+    # Get statistics from the store (the indexer kept nothing in memory)
+    stats = store.get_stats()
     print("Index Statistics:")
     print(f"  Total objects: {stats['total_objects']}")
-    print(f"  Unique names: {stats['unique_names']}")
-    print(f"  Qualified names: {stats['qualified_names']}")
     print()
     print("  Objects by type:")
-    for obj_type, count in stats['type_counts'].items():
-        print(f"    {obj_type}: {count}")
+    for obj_type, type_count in stats['type_counts'].items():
+        print(f"    {obj_type}: {type_count}")
 
     print()
 
-    # Store in database
-    print("Storing index in database...")
-    all_objects = indexer.get_all_objects()
-    store.add_objects_batch(all_objects)
-    print(f"  Stored {len(all_objects)} objects")
-
+    print(f"Stored {count} objects in database")
     print()
 
     # Show overall database stats
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     qdrant_url: str = "http://localhost:6333"
     qdrant_path: str = "./qdrant_storage"
     qdrant_collection_name: str = "documents"
+    # Store embeddings int8-quantized in Qdrant (4x less vector RAM,
+    # faster scoring; applies when the collection is first created)
+    qdrant_quantize_embeddings: bool = True
 
     # Server Configuration
     fastapi_host: str = "0.0.0.0"
@@ -27,6 +30,15 @@ class Settings(BaseSettings):
     # Google AI Models
     embedding_model: str = "text-embedding-004"
     llm_model: str = "gemini-1.5-flash"
+    llm_temperature: float = 0.7
+    llm_max_output_tokens: int = 2048
+    llm_top_p: float = 0.95
+
+    # Query Result Cache
+    enable_query_cache: bool = True
+    query_cache_ttl: int = 300  # Seconds an entry stays valid
+    query_cache_max_entries: int = 256
+    query_cache_hot_threshold: int = 3  # Hits before background refresh
 
     # Rate Limiting Configuration
     google_api_rpm_limit: int = 15  # Requests per minute
@@ -4,8 +4,34 @@ import asyncio
 import sys
 from pathlib import Path
 
+import orjson
+
 from rag_server.rag_system import RAGSystem
 
+# Fingerprints (mtime + size) of previously ingested files; re-runs skip
+# files whose fingerprint is unchanged, so only new or edited docs pay
+# the chunk + embed + upsert cost
+FINGERPRINT_PATH = Path("./.ingest_fingerprints.json")
+
+
+def _load_fingerprints() -> dict:
+    """Load the fingerprint map from the previous ingestion run."""
+    try:
+        return orjson.loads(FINGERPRINT_PATH.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
+
+def _save_fingerprints(fingerprints: dict):
+    """Persist the fingerprint map for the next run."""
+    FINGERPRINT_PATH.write_bytes(orjson.dumps(fingerprints))
+
+
+def _fingerprint(file_path: Path) -> str:
+    """Fingerprint a file by mtime and size (no content read needed)."""
+    stat = file_path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
 
 async def ingest_directory(
     rag_system: RAGSystem,
@@ -49,6 +75,8 @@ async def ingest_directory(
 
     successful = 0
     failed = 0
+    skipped = 0
+    fingerprints = _load_fingerprints()
 
     for i, file_path in enumerate(all_files, 1):
         try:
@@ -58,6 +86,15 @@ async def ingest_directory(
             except ValueError:
                 rel_path = file_path
 
+            # Skip files unchanged since the last run
+            fp_key = str(file_path)
+            fp = _fingerprint(file_path)
+            if fingerprints.get(fp_key) == fp:
+                print(f"[{i}/{len(all_files)}] Skipping (unchanged): {rel_path}")
+                skipped += 1
+                print()
+                continue
+
             print(f"[{i}/{len(all_files)}] Processing: {rel_path}")
 
             # Add document to RAG system
@@ -69,6 +106,7 @@ async def ingest_directory(
 
             print(f"  ✓ Added: {result['num_chunks']} chunks")
             print(f"    Doc ID: {result['doc_id']}")
+            fingerprints[fp_key] = fp
             successful += 1
 
         except Exception as e:
@@ -77,9 +115,12 @@ async def ingest_directory(
 
         print()
 
+    _save_fingerprints(fingerprints)
+
     print("=" * 60)
     print(f"Ingestion complete!")
     print(f"  Successful: {successful}")
+    print(f"  Skipped (unchanged): {skipped}")
     print(f"  Failed: {failed}")
     print(f"  Total: {len(all_files)}")
 
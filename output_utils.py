@@ -0,0 +1,59 @@
+"""Output helpers shared by the test scripts."""
+
+import atexit
+import sys
+
+
+def enable_block_buffering():
+    """
+    Switch stdout to block buffering for the duration of a test script.
+
+    On a tty stdout is line-buffered, so every print flushes; the
+    verbose scripts here emit hundreds of lines and pay a syscall each.
+    Block buffering batches them and an atexit hook flushes whatever is
+    left, so output format is unchanged.
+    """
+    try:
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    except (AttributeError, ValueError):
+        # stdout replaced by something that is not a TextIOWrapper
+        return
+    atexit.register(sys.stdout.flush)
+
+
+def truncate(text, limit):
+    """
+    Return text unchanged if it fits, else one sliced copy with "...".
+
+    Replaces the inline `s[:n] + "..." if len(s) > n else s` ternaries
+    scattered through the test scripts; the common short-string case
+    allocates nothing.
+
+    Args:
+        text: String to bound
+        limit: Maximum number of characters to keep
+    """
+    if len(text) <= limit:
+        return text
+    return text[:limit] + "..."
+
+
+def emit(result, limit=None):
+    """
+    Print tool-result text in a single buffered write.
+
+    Joining the items and writing once avoids a write syscall per item,
+    which adds up on long tool outputs in CI log pipelines.
+
+    Args:
+        result: List of TextContent items from call_tool
+        limit: Optional per-item character limit before truncation
+    """
+    parts = []
+    for item in result:
+        text = item.text
+        if limit is not None and len(text) > limit:
+            text = text[:limit] + "\n... (truncated)"
+        parts.append(text)
+    sys.stdout.write("\n".join(parts) + "\n")
+    sys.stdout.flush()
@@ -0,0 +1,24 @@
+"""Shared RAGSystem instance for the test scripts.
+
+Constructing RAGSystem opens the vector index, rate-limit store, and code
+index; doing that once per process instead of once per test keeps
+repeated queries warm when the scripts run as a suite.
+
+The import of RAGSystem lives inside get_rag() so merely importing this
+module (e.g. during pytest collection) stays cheap: nothing model- or
+index-related loads until the first test actually asks for the system.
+"""
+
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rag_server.rag_system import RAGSystem
+
+
+@functools.lru_cache(maxsize=1)
+def get_rag() -> "RAGSystem":
+    """Get the process-wide RAGSystem instance (created on first use)."""
+    from rag_server.rag_system import RAGSystem
+
+    return RAGSystem()
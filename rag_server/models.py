@@ -66,12 +66,23 @@ class DeleteResponse(BaseModel):
     message: str = "Document deleted successfully"
 
 
+class QueryCacheStats(BaseModel):
+    """Query cache statistics."""
+
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+    hot_refreshes: int
+
+
 class StatsResponse(BaseModel):
     """Response model for system statistics."""
 
     total_documents: int
     total_chunks: int
     collection_name: str
+    query_cache: Optional[QueryCacheStats] = None
 
 
 class HealthResponse(BaseModel):
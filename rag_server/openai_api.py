@@ -213,6 +213,8 @@ async def create_chat_completion(
             return StreamingResponse(
                 generate_streaming_response(rag_result, request_id, request.model, created),
                 media_type="text/event-stream",
+                # Tell reverse proxies (nginx) not to buffer the SSE stream
+                headers={"X-Accel-Buffering": "no"},
             )
 
         # Non-streaming response
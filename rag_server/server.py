@@ -1,13 +1,15 @@
 """FastAPI server for the RAG system."""
 
+import asyncio
 import tempfile
 import traceback
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from config.settings import settings
 from rag_server.models import (
@@ -24,11 +26,32 @@ from rag_server.models import (
 from rag_server.rag_system import RAGSystem
 
 
+async def _warmup_rag_system(rag_system: RAGSystem) -> None:
+    """
+    Pre-warm lazy components so the first /query doesn't pay cold-start costs.
+
+    Qdrant's collection handles and the embedding endpoint's TLS connection
+    are initialized lazily; a throwaway embedding call and a collection-info
+    fetch prime both during startup. Failures are non-fatal (e.g. missing
+    API key or rate limits) - the first real request just pays the cost.
+    """
+    results = await asyncio.gather(
+        asyncio.to_thread(rag_system.embedding_service.embed_query, "warmup"),
+        asyncio.to_thread(rag_system.vector_store.get_collection_info),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Warning: warmup call failed: {result}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
-    # Startup: Initialize RAG system
-    app.state.rag_system = RAGSystem()
+    # Startup: Initialize RAG system and prime its lazy connections
+    rag_system = RAGSystem()
+    app.state.rag_system = rag_system
+    await _warmup_rag_system(rag_system)
     yield
     # Shutdown: cleanup if needed
     app.state.rag_system = None
@@ -40,8 +63,15 @@ app = FastAPI(
     description="Retrieval-Augmented Generation server with Google AI Studio integration",
     version="0.1.0",
     lifespan=lifespan,
+    # orjson serializes nested dict/list payloads (and the dataclasses/enums
+    # in smart query results) several times faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
+# Compress large JSON bodies (/query context_used, /documents listings).
+# Small responses pass through untouched to avoid per-request overhead.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Add CORS middleware for web UI access
 app.add_middleware(
     CORSMiddleware,
@@ -1,6 +1,6 @@
 """Smart query handler with tiered decision routing."""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 
 from utils.query_classifier import QueryClassifier, QueryClassification, QueryType
@@ -2,6 +2,7 @@
 
 import asyncio
 from mcp_server.server import call_tool
+from output_utils import emit, enable_block_buffering
 
 async def test_class_modes():
     """Test class-specific retrieval modes."""
@@ -19,8 +20,7 @@ async def test_class_modes():
         "get_source_code_advanced",
         {"github_url": class_url, "mode": "signature"}
     )
-    for item in result1:
-        print(item.text)
+    emit(result1)
 
     # Test 2: Methods List
     print("\n[Test 2] Methods List")
@@ -29,8 +29,7 @@ async def test_class_modes():
         "get_source_code_advanced",
         {"github_url": class_url, "mode": "methods_list"}
     )
-    for item in result2:
-        print(item.text)
+    emit(result2)
 
     # Test 3: Class Outline
     print("\n[Test 3] Class Outline (first 2000 chars)")
@@ -39,9 +38,7 @@ async def test_class_modes():
         "get_source_code_advanced",
         {"github_url": class_url, "mode": "outline"}
     )
-    for item in result3:
-        text = item.text
-        print(text[:2000] + "..." if len(text) > 2000 else text)
+    emit(result3, limit=2000)
 
     # Test 4: Full Implementation (truncated)
     print("\n[Test 4] Full Implementation (first 1500 chars)")
@@ -50,9 +47,7 @@ async def test_class_modes():
         "get_source_code_advanced",
         {"github_url": class_url, "mode": "full", "context_lines": 30}
     )
-    for item in result4:
-        text = item.text
-        print(text[:1500] + "..." if len(text) > 1500 else text)
+    emit(result4, limit=1500)
 
     # Test 5: Specific Method
     print("\n[Test 5] Extract Specific Method: 'eager'")
@@ -61,13 +56,12 @@ async def test_class_modes():
         "get_source_code_advanced",
         {"github_url": class_url, "method_name": "eager"}
     )
-    for item in result5:
-        text = item.text
-        print(text[:1500] + "..." if len(text) > 1500 else text)
+    emit(result5, limit=1500)
 
     print("\n" + "=" * 80)
     print("All class mode tests complete!")
     print("=" * 80)
 
 if __name__ == "__main__":
+    enable_block_buffering()
     asyncio.run(test_class_modes())
@@ -1,11 +1,13 @@
 """Test documentation search."""
 
 import asyncio
-from rag_server.rag_system import RAGSystem
+
+from output_utils import enable_block_buffering
+from rag_fixture import get_rag
 
 
 def main():
-    rag = RAGSystem()
+    rag = get_rag()
 
     # Test documentation query
     result = rag.query('what are automation conditions in Dagster?', top_k=5)
@@ -29,4 +31,5 @@ def main():
 
 
 if __name__ == '__main__':
+    enable_block_buffering()
     main()
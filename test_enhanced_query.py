@@ -1,11 +1,12 @@
 """Test script for enhanced query with self-thinking."""
 
 import asyncio
-from rag_server.rag_system import RAGSystem
+from output_utils import enable_block_buffering, truncate
+from rag_fixture import get_rag
 
 async def test_enhanced_query():
     """Test the enhanced query system."""
-    rag = RAGSystem()
+    rag = get_rag()
 
     print("=" * 80)
     print("Testing Enhanced RAG Query with Self-Thinking")
@@ -46,7 +47,7 @@ async def test_enhanced_query():
                 print(f"\n### Reference: {ref}")
                 print(f"Query: {ref_data['query']}")
                 print(f"\nAnswer (first 300 chars):")
-                print(ref_data['answer'][:300] + "..." if len(ref_data['answer']) > 300 else ref_data['answer'])
+                print(truncate(ref_data['answer'], 300))
                 print(f"\nSources:")
                 for source in ref_data['sources']:
                     print(f"  - {source['section_path']} (score: {source['score']:.4f})")
@@ -63,7 +64,7 @@ async def test_enhanced_query():
                 if code_data.get('name') and code_data['name'] != 'unknown':
                     print(f"Type: {code_data['type']}, Name: {code_data['name']}")
                 print(f"\nCode (first 500 chars):")
-                print(code_data['code'][:500] + "..." if len(code_data['code']) > 500 else code_data['code'])
+                print(truncate(code_data['code'], 500))
 
         print("\n" + "=" * 80)
         print("SUMMARY")
@@ -82,4 +83,5 @@ async def test_enhanced_query():
     print("=" * 80)
 
 if __name__ == "__main__":
+    enable_block_buffering()
     asyncio.run(test_enhanced_query())
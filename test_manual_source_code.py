@@ -2,6 +2,7 @@
 
 import asyncio
 from mcp_server.server import call_tool
+from output_utils import emit, enable_block_buffering
 
 async def test_manual():
     """Test with a manual insertion of a query response that includes a GitHub URL."""
@@ -19,9 +20,7 @@ async def test_manual():
     )
 
     print("Regular query response (truncated):")
-    for item in result1:
-        text = item.text
-        print(text[:600] + "..." if len(text) > 600 else text)
+    emit(result1, limit=600)
 
     # Now test the enhanced version
     print("\n\n[Test 2] Enhanced query about asset decorator")
@@ -33,8 +32,7 @@ async def test_manual():
     )
 
     print("\nEnhanced query response:")
-    for item in result2:
-        print(item.text)
+    emit(result2)
 
     # Test with source code tool directly
     print("\n\n[Test 3] Direct source code retrieval")
@@ -49,13 +47,12 @@ async def test_manual():
     )
 
     print("Source code retrieval response (truncated):")
-    for item in result3:
-        text = item.text
-        print(text[:1000] + "..." if len(text) > 1000 else text)
+    emit(result3, limit=1000)
 
     print("\n" + "=" * 80)
     print("All tests complete")
     print("=" * 80)
 
 if __name__ == "__main__":
+    enable_block_buffering()
     asyncio.run(test_manual())
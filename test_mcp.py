@@ -1,7 +1,6 @@
 """Test script to verify MCP server works correctly."""
 
 import asyncio
-import json
 from mcp_server.server import list_tools, call_tool
 
 
@@ -2,6 +2,7 @@
 
 import asyncio
 from mcp_server.server import call_tool
+from output_utils import emit, enable_block_buffering
 
 async def test_enhanced_mcp():
     """Test the enhanced query MCP tool."""
@@ -20,12 +21,12 @@ async def test_enhanced_mcp():
 
     print("\nMCP Tool Response:")
     print("=" * 80)
-    for item in result:
-        print(item.text)
+    emit(result)
 
     print("\n" + "=" * 80)
     print("Test Complete")
     print("=" * 80)
 
 if __name__ == "__main__":
+    enable_block_buffering()
     asyncio.run(test_enhanced_mcp())
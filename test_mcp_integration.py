@@ -1,8 +1,8 @@
 """Test MCP server integration by simulating tool calls."""
 
 import asyncio
-import json
 from mcp_server.server import call_tool
+from output_utils import emit, enable_block_buffering
 
 async def test_mcp_tools():
     """Test MCP tools by calling them directly."""
@@ -10,81 +10,67 @@ async def test_mcp_tools():
     print("MCP Server Integration Test")
     print("=" * 80)
 
-    # Test 1: Query RAG
-    print("\n[Test 1] Testing query_rag tool")
-    print("-" * 80)
+    # The five tools have no ordering dependencies, so run the heavy calls
+    # (query_rag embeds + hits the LLM, get_source_code parses a file)
+    # concurrently with each other, then the three cheap metadata calls
+    # concurrently too. Results print in the original test order.
+    query_result, source_result = await asyncio.gather(
+        call_tool(
+            "query_rag",
+            {
+                "question": "how should I use asset automation to update an asset everytime the upstream is updated",
+                "top_k": 5
+            }
+        ),
+        call_tool(
+            "get_source_code",
+            {
+                "github_url": "https://github.com/dagster-io/dagster/blob/master/python_modules/dagster/dagster/_core/definitions/decorators/asset_decorator.py#L130",
+                "context_lines": 10
+            }
+        ),
+    )
 
-    result = await call_tool(
-        "query_rag",
-        {
-            "question": "how should I use asset automation to update an asset everytime the upstream is updated",
-            "top_k": 5
-        }
+    stats_result, tags_result, docs_result = await asyncio.gather(
+        call_tool("get_rag_stats", {}),
+        call_tool("get_tags", {}),
+        call_tool("list_documents", {}),
     )
 
+    # Test 1: Query RAG
+    print("\n[Test 1] Testing query_rag tool")
+    print("-" * 80)
     print("Response:")
-    for item in result:
-        print(item.text)
+    emit(query_result)
 
     # Test 2: Get RAG stats
     print("\n[Test 2] Testing get_rag_stats tool")
     print("-" * 80)
-
-    result = await call_tool("get_rag_stats", {})
-
     print("Response:")
-    for item in result:
-        print(item.text)
+    emit(stats_result)
 
     # Test 3: Get tags
     print("\n[Test 3] Testing get_tags tool")
     print("-" * 80)
-
-    result = await call_tool("get_tags", {})
-
     print("Response:")
-    for item in result:
-        print(item.text)
+    emit(tags_result)
 
     # Test 4: Source code retrieval with a known Dagster URL
     print("\n[Test 4] Testing get_source_code tool")
     print("-" * 80)
-
-    result = await call_tool(
-        "get_source_code",
-        {
-            "github_url": "https://github.com/dagster-io/dagster/blob/master/python_modules/dagster/dagster/_core/definitions/decorators/asset_decorator.py#L130",
-            "context_lines": 10
-        }
-    )
-
     print("Response:")
-    for item in result:
-        # Print first 1000 chars to avoid too much output
-        text = item.text
-        if len(text) > 1000:
-            print(text[:1000] + "\n... (truncated)")
-        else:
-            print(text)
+    emit(source_result, limit=1000)
 
     # Test 5: List documents
     print("\n[Test 5] Testing list_documents tool")
     print("-" * 80)
-
-    result = await call_tool("list_documents", {})
-
     print("Response:")
-    for item in result:
-        # Print first 1000 chars
-        text = item.text
-        if len(text) > 1000:
-            print(text[:1000] + "\n... (truncated)")
-        else:
-            print(text)
+    emit(docs_result, limit=1000)
 
     print("\n" + "=" * 80)
     print("All MCP Integration Tests Complete!")
     print("=" * 80)
 
 if __name__ == "__main__":
+    enable_block_buffering()
     asyncio.run(test_mcp_tools())
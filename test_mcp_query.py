@@ -1,11 +1,19 @@
 """Test script to query the RAG system directly."""
 
 import asyncio
-from rag_server.rag_system import RAGSystem
+import re
+
+from output_utils import enable_block_buffering
+from rag_fixture import get_rag
+
+# Compiled once at import; the findall loop below runs per context chunk.
+_GH_URL_RE = re.compile(
+    r'https://github\.com/dagster-io/dagster/blob/master/python_modules/[^\s\)]+'
+)
 
 async def test_query():
     """Test querying the RAG system."""
-    rag = RAGSystem()
+    rag = get_rag()
 
     print("=" * 80)
     print("Testing RAG System Query")
@@ -39,12 +47,7 @@ async def test_query():
         github_urls = []
         for context in result['context_used']:
             # Look for GitHub URLs in the context
-            import re
-            urls = re.findall(
-                r'https://github\.com/dagster-io/dagster/blob/master/python_modules/[^\s\)]+',
-                context
-            )
-            github_urls.extend(urls)
+            github_urls.extend(_GH_URL_RE.findall(context))
 
         if github_urls:
             print(f"\nFound {len(github_urls)} GitHub URL(s) in the context")
@@ -80,4 +83,5 @@ async def test_query():
     print("=" * 80)
 
 if __name__ == "__main__":
+    enable_block_buffering()
     asyncio.run(test_query())
@@ -3,6 +3,21 @@
 import asyncio
 from mcp_server.server import list_tools
 
+# Feature checks for get_source_code_advanced: each entry pairs the
+# substrings that must all appear in the description with the line to
+# print. The needle set is built once at import and scanned in a single
+# pass per description.
+_FEATURE_CHECKS = [
+    (("MODE DETAILS",), "Contains MODE DETAILS section"),
+    (("signature", "~1-2 lines"), "Explains signature mode with line count"),
+    (("methods_list", "~10-30 lines"), "Explains methods_list mode with line count"),
+    (("outline", "~50-200 lines"), "Explains outline mode with line count"),
+    (("full", "~100-1000+ lines"), "Explains full mode with line count"),
+    (("DECISION GUIDE",), "Contains DECISION GUIDE section"),
+    (("What is X?",), "Contains usage examples"),
+]
+_KEYWORDS = frozenset(kw for needles, _ in _FEATURE_CHECKS for kw in needles)
+
 async def test_tool_descriptions():
     """Test tool descriptions."""
     print("=" * 80)
@@ -21,20 +36,10 @@ async def test_tool_descriptions():
         if tool.name == "get_source_code_advanced":
             print("\n[Key Features Highlighted]")
             desc = tool.description
-            if "MODE DETAILS" in desc:
-                print("✓ Contains MODE DETAILS section")
-            if "signature" in desc and "~1-2 lines" in desc:
-                print("✓ Explains signature mode with line count")
-            if "methods_list" in desc and "~10-30 lines" in desc:
-                print("✓ Explains methods_list mode with line count")
-            if "outline" in desc and "~50-200 lines" in desc:
-                print("✓ Explains outline mode with line count")
-            if "full" in desc and "~100-1000+ lines" in desc:
-                print("✓ Explains full mode with line count")
-            if "DECISION GUIDE" in desc:
-                print("✓ Contains DECISION GUIDE section")
-            if "What is X?" in desc:
-                print("✓ Contains usage examples")
+            found = {kw for kw in _KEYWORDS if kw in desc}
+            for needles, label in _FEATURE_CHECKS:
+                if found.issuperset(needles):
+                    print(f"✓ {label}")
 
         print("\nInput Schema:")
         for prop_name, prop_info in tool.inputSchema.get("properties", {}).items():
@@ -2,6 +2,7 @@
 
 import asyncio
 from mcp_server.server import call_tool
+from output_utils import emit, enable_block_buffering
 
 async def test_all_modes():
     """Test all retrieval modes."""
@@ -19,8 +20,7 @@ async def test_all_modes():
         "get_source_code_advanced",
         {"github_url": test_url, "mode": "signature"}
     )
-    for item in result1:
-        print(item.text)
+    emit(result1)
 
     # Test 2: Full implementation (default)
     print("\n\n[Test 2] Mode: full (first 1000 chars)")
@@ -29,9 +29,7 @@ async def test_all_modes():
         "get_source_code_advanced",
         {"github_url": test_url, "mode": "full", "context_lines": 15}
     )
-    for item in result2:
-        text = item.text
-        print(text[:1000] + "..." if len(text) > 1000 else text)
+    emit(result2, limit=1000)
 
     # Test 3: Class outline (if it's a class)
     print("\n\n[Test 3] Mode: outline (for class)")
@@ -42,9 +40,7 @@ async def test_all_modes():
         "get_source_code_advanced",
         {"github_url": class_url, "mode": "outline"}
     )
-    for item in result3:
-        text = item.text
-        print(text[:1500] + "..." if len(text) > 1500 else text)
+    emit(result3, limit=1500)
 
     # Test 4: Methods list
     print("\n\n[Test 4] Mode: methods_list (for class)")
@@ -53,8 +49,7 @@ async def test_all_modes():
         "get_source_code_advanced",
         {"github_url": class_url, "mode": "methods_list"}
     )
-    for item in result4:
-        print(item.text)
+    emit(result4)
 
     # Test 5: Specific method extraction
     print("\n\n[Test 5] Extract specific method from class")
@@ -70,4 +65,5 @@ async def test_all_modes():
     print("=" * 80)
 
 if __name__ == "__main__":
+    enable_block_buffering()
     asyncio.run(test_all_modes())
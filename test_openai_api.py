@@ -1,203 +1,233 @@
 """Test script for OpenAI-compatible API."""
 
-import requests
-import json
+import asyncio
+import io
+
+import httpx
+import orjson
 
 
 BASE_URL = "http://localhost:8000/v1"
 
+# Request bodies encoded once at import with orjson; each test sends the
+# pre-built bytes instead of re-serializing its dict per call
+PAYLOADS = {
+    "chat": orjson.dumps({
+        "model": "rag-smart",
+        "messages": [
+            {"role": "user", "content": "What is a RAGSystem?"}
+        ],
+        "stream": False,
+    }),
+    "streaming": orjson.dumps({
+        "model": "rag-smart",
+        "messages": [
+            {"role": "user", "content": "What is a RAGSystem?"}
+        ],
+        "stream": True,
+    }),
+    "custom": orjson.dumps({
+        "model": "rag-smart",
+        "messages": [
+            {"role": "user", "content": "show me query method"}
+        ],
+        "expand_detail": True,
+        "top_k": 3,
+    }),
+    # Tiny request sent once before the timed tests so their first call
+    # doesn't pay the server's cold start (index mmap, model load)
+    "warmup": orjson.dumps({
+        "model": "rag-smart",
+        "messages": [
+            {"role": "user", "content": "ping"}
+        ],
+        "max_tokens": 1,
+    }),
+    "system": orjson.dumps({
+        "model": "rag-smart",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant. Be very concise."
+            },
+            {
+                "role": "user",
+                "content": "What is RAGSystem?"
+            }
+        ],
+    }),
+}
+
+
+def _parse(response: httpx.Response) -> dict:
+    """Decode a JSON body with orjson (~3x faster than stdlib json)."""
+    return orjson.loads(response.content)
 
-def test_list_models():
+
+async def test_list_models(client: httpx.AsyncClient):
     """Test listing available models."""
-    print("=" * 70)
-    print("Test 1: List Models")
-    print("=" * 70)
+    out = io.StringIO()
+    print("=" * 70, file=out)
+    print("Test 1: List Models", file=out)
+    print("=" * 70, file=out)
 
-    response = requests.get(f"{BASE_URL}/models")
-    print(f"Status: {response.status_code}")
+    response = await client.get("/models")
+    print(f"Status: {response.status_code}", file=out)
 
     if response.status_code == 200:
-        data = response.json()
-        print(f"Models found: {len(data['data'])}")
-        for model in data["data"]:
-            print(f"  - {model['id']}")
-        print("✓ Test passed\n")
-        return True
+        ids = [model["id"] for model in _parse(response)["data"]]
+        print(f"Models found: {len(ids)}", file=out)
+        # One write for the whole listing instead of one per model
+        out.write("\n".join(f"  - {model_id}" for model_id in ids) + "\n")
+        print("✓ Test passed\n", file=out)
+        return True, out.getvalue()
     else:
-        print(f"✗ Test failed: {response.text}\n")
-        return False
+        print(f"✗ Test failed: {response.text}\n", file=out)
+        return False, out.getvalue()
 
 
-def test_chat_completion():
+async def test_chat_completion(client: httpx.AsyncClient):
     """Test chat completion."""
-    print("=" * 70)
-    print("Test 2: Chat Completion (Non-streaming)")
-    print("=" * 70)
+    out = io.StringIO()
+    print("=" * 70, file=out)
+    print("Test 2: Chat Completion (Non-streaming)", file=out)
+    print("=" * 70, file=out)
 
-    payload = {
-        "model": "rag-smart",
-        "messages": [
-            {"role": "user", "content": "What is a RAGSystem?"}
-        ],
-        "stream": False,
-    }
+    response = await client.post("/chat/completions", content=PAYLOADS["chat"])
 
-    response = requests.post(
-        f"{BASE_URL}/chat/completions",
-        json=payload,
-        headers={"Content-Type": "application/json"},
-    )
-
-    print(f"Status: {response.status_code}")
+    print(f"Status: {response.status_code}", file=out)
 
     if response.status_code == 200:
-        data = response.json()
-        print(f"Model: {data['model']}")
-        print(f"Response ID: {data['id']}")
-        print(f"Answer: {data['choices'][0]['message']['content'][:200]}...")
-        print(f"Tokens: {data['usage']['total_tokens']}")
+        data = _parse(response)
+        print(f"Model: {data['model']}", file=out)
+        print(f"Response ID: {data['id']}", file=out)
+        print(f"Answer: {data['choices'][0]['message']['content'][:200]}...", file=out)
+        print(f"Tokens: {data['usage']['total_tokens']}", file=out)
 
         if data.get('rag_metadata'):
-            print(f"Confidence: {data['rag_metadata'].get('confidence')}")
-            print(f"Query type: {data['rag_metadata'].get('classification', {}).get('type')}")
+            print(f"Confidence: {data['rag_metadata'].get('confidence')}", file=out)
+            print(f"Query type: {data['rag_metadata'].get('classification', {}).get('type')}", file=out)
 
-        print("✓ Test passed\n")
-        return True
+        print("✓ Test passed\n", file=out)
+        return True, out.getvalue()
     else:
-        print(f"✗ Test failed: {response.text}\n")
-        return False
+        print(f"✗ Test failed: {response.text}\n", file=out)
+        return False, out.getvalue()
 
 
-def test_chat_completion_streaming():
+async def test_chat_completion_streaming(client: httpx.AsyncClient):
     """Test streaming chat completion."""
-    print("=" * 70)
-    print("Test 3: Chat Completion (Streaming)")
-    print("=" * 70)
-
-    payload = {
-        "model": "rag-smart",
-        "messages": [
-            {"role": "user", "content": "What is a RAGSystem?"}
-        ],
-        "stream": True,
-    }
-
-    response = requests.post(
-        f"{BASE_URL}/chat/completions",
-        json=payload,
-        headers={"Content-Type": "application/json"},
-        stream=True,
-    )
-
-    print(f"Status: {response.status_code}")
-
-    if response.status_code == 200:
-        print("Streaming response:")
+    out = io.StringIO()
+    print("=" * 70, file=out)
+    print("Test 3: Chat Completion (Streaming)", file=out)
+    print("=" * 70, file=out)
+
+    async with client.stream(
+        "POST", "/chat/completions", content=PAYLOADS["streaming"]
+    ) as response:
+        print(f"Status: {response.status_code}", file=out)
+
+        if response.status_code != 200:
+            text = (await response.aread()).decode()
+            print(f"✗ Test failed: {text}\n", file=out)
+            return False, out.getvalue()
+
+        print("Streaming response:", file=out)
         chunk_count = 0
 
-        for line in response.iter_lines():
-            if line:
-                line_str = line.decode('utf-8')
-                if line_str.startswith('data: '):
-                    data_str = line_str[6:]  # Remove 'data: ' prefix
-
-                    if data_str == '[DONE]':
+        # Parse SSE frames as bytes (no per-frame UTF-8 decode);
+        # orjson.loads accepts the byte slice directly. Events are split
+        # on the b"\n\n" frame boundary rather than line by line, so the
+        # inner loop runs once per event on a mutable bytearray instead
+        # of once per line on fresh bytes copies.
+        data_prefix = b'data: '
+        done = b'[DONE]'
+        loads = orjson.loads
+        write = out.write
+        buf = bytearray()
+        finished = False
+
+        async for raw in response.aiter_bytes(chunk_size=16384):
+            buf += raw
+            while (idx := buf.find(b"\n\n")) != -1:
+                event = bytes(buf[:idx])
+                del buf[:idx + 2]
+
+                for field in event.split(b"\n"):
+                    field = field.rstrip(b"\r")
+                    if not field.startswith(data_prefix):
+                        continue
+                    data = field[6:]  # Remove 'data: ' prefix
+
+                    if data == done:
+                        finished = True
                         break
 
                     try:
-                        chunk = json.loads(data_str)
+                        chunk = loads(data)
                         delta = chunk['choices'][0]['delta']
 
-                        if delta.get('content'):
-                            print(delta['content'], end='', flush=True)
+                        content = delta.get('content')
+                        if content:
+                            write(content)
                             chunk_count += 1
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         pass
+            if finished:
+                break
 
-        print(f"\n\nReceived {chunk_count} chunks")
-        print("✓ Test passed\n")
-        return True
-    else:
-        print(f"✗ Test failed: {response.text}\n")
-        return False
+        print(f"\n\nReceived {chunk_count} chunks", file=out)
+        print("✓ Test passed\n", file=out)
+        return True, out.getvalue()
 
 
-def test_custom_parameters():
+async def test_custom_parameters(client: httpx.AsyncClient):
     """Test custom RAG parameters."""
-    print("=" * 70)
-    print("Test 4: Custom Parameters")
-    print("=" * 70)
+    out = io.StringIO()
+    print("=" * 70, file=out)
+    print("Test 4: Custom Parameters", file=out)
+    print("=" * 70, file=out)
 
-    payload = {
-        "model": "rag-smart",
-        "messages": [
-            {"role": "user", "content": "show me query method"}
-        ],
-        "expand_detail": True,
-        "top_k": 3,
-    }
-
-    response = requests.post(
-        f"{BASE_URL}/chat/completions",
-        json=payload,
-        headers={"Content-Type": "application/json"},
-    )
+    response = await client.post("/chat/completions", content=PAYLOADS["custom"])
 
-    print(f"Status: {response.status_code}")
+    print(f"Status: {response.status_code}", file=out)
 
     if response.status_code == 200:
-        data = response.json()
-        print(f"Model: {data['model']}")
+        data = _parse(response)
+        print(f"Model: {data['model']}", file=out)
         answer = data['choices'][0]['message']['content']
-        print(f"Answer length: {len(answer)} characters")
-        print(f"First 200 chars: {answer[:200]}...")
-        print("✓ Test passed\n")
-        return True
+        print(f"Answer length: {len(answer)} characters", file=out)
+        print(f"First 200 chars: {answer[:200]}...", file=out)
+        print("✓ Test passed\n", file=out)
+        return True, out.getvalue()
     else:
-        print(f"✗ Test failed: {response.text}\n")
-        return False
+        print(f"✗ Test failed: {response.text}\n", file=out)
+        return False, out.getvalue()
 
 
-def test_system_message():
+async def test_system_message(client: httpx.AsyncClient):
     """Test system message support."""
-    print("=" * 70)
-    print("Test 5: System Message")
-    print("=" * 70)
+    out = io.StringIO()
+    print("=" * 70, file=out)
+    print("Test 5: System Message", file=out)
+    print("=" * 70, file=out)
 
-    payload = {
-        "model": "rag-smart",
-        "messages": [
-            {
-                "role": "system",
-                "content": "You are a helpful assistant. Be very concise."
-            },
-            {
-                "role": "user",
-                "content": "What is RAGSystem?"
-            }
-        ],
-    }
-
-    response = requests.post(
-        f"{BASE_URL}/chat/completions",
-        json=payload,
-        headers={"Content-Type": "application/json"},
-    )
+    response = await client.post("/chat/completions", content=PAYLOADS["system"])
 
-    print(f"Status: {response.status_code}")
+    print(f"Status: {response.status_code}", file=out)
 
     if response.status_code == 200:
-        data = response.json()
+        data = _parse(response)
         answer = data['choices'][0]['message']['content']
-        print(f"Answer: {answer[:300]}...")
-        print("✓ Test passed\n")
-        return True
+        print(f"Answer: {answer[:300]}...", file=out)
+        print("✓ Test passed\n", file=out)
+        return True, out.getvalue()
     else:
-        print(f"✗ Test failed: {response.text}\n")
-        return False
+        print(f"✗ Test failed: {response.text}\n", file=out)
+        return False, out.getvalue()
 
 
-def main():
+async def main():
     """Run all tests."""
     print("\n")
     print("=" * 70)
@@ -209,13 +239,42 @@ def main():
     print("  python -m rag_server.server")
     print()
 
-    # Run tests
+    # The five tests are independent, so run them on one event loop with
+    # a single pooled AsyncClient: the streaming test overlaps with the
+    # four non-streaming ones and wall clock approaches the slowest test
+    # instead of the sum. Each test logs into its own buffer, so output
+    # never interleaves and prints in the original order below.
+    tests = [
+        ("List Models", test_list_models),
+        ("Chat Completion", test_chat_completion),
+        ("Streaming", test_chat_completion_streaming),
+        ("Custom Parameters", test_custom_parameters),
+        ("System Message", test_system_message),
+    ]
+
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=60,
+        headers={"Content-Type": "application/json"},
+        limits=httpx.Limits(max_keepalive_connections=5),
+    ) as client:
+        # Warm the server first: the response is discarded, the point is
+        # that cold-start cost lands here and not in the timed tests
+        print("Warming up server (one tiny completion)...")
+        await client.post("/chat/completions", content=PAYLOADS["warmup"])
+        print()
+
+        outcomes = await asyncio.gather(
+            *[test(client) for _, test in tests], return_exceptions=True
+        )
+
     results = []
-    results.append(("List Models", test_list_models()))
-    results.append(("Chat Completion", test_chat_completion()))
-    results.append(("Streaming", test_chat_completion_streaming()))
-    results.append(("Custom Parameters", test_custom_parameters()))
-    results.append(("System Message", test_system_message()))
+    for (name, _), outcome in zip(tests, outcomes):
+        if isinstance(outcome, BaseException):
+            raise outcome
+        ok, log = outcome
+        print(log, end="")
+        results.append((name, ok))
 
     # Summary
     print("=" * 70)
@@ -243,8 +302,8 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
-    except requests.exceptions.ConnectionError:
+        asyncio.run(main())
+    except httpx.ConnectError:
         print("\n❌ Error: Could not connect to server.")
         print("Make sure the RAG server is running:")
         print("  python -m rag_server.server")
@@ -6,16 +6,26 @@ This script tests the GoogleAPIClient to ensure rate limits are properly enforce
 
 import os
 import sys
-from dotenv import load_dotenv
+from pathlib import Path
 
-from utils.google_api_client import GoogleAPIClient, RateLimitExceededError
+from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 
-def test_basic_functionality():
-    """Test basic API calls and rate limit tracking."""
+def test_basic_functionality(sequential: bool = False):
+    """
+    Test basic API calls and rate limit tracking.
+
+    Args:
+        sequential: Make the step-4 calls one by one instead of batched
+                    (useful to watch the RPM limit trip call by call)
+    """
+    # Imported inside the function so pytest collection of this module
+    # doesn't load the Google SDK
+    from utils.google_api_client import GoogleAPIClient, RateLimitExceededError
+
     print("=" * 60)
     print("Testing Basic Functionality")
     print("=" * 60)
@@ -29,12 +39,25 @@ def test_basic_functionality():
         rate_limit_db_path="./test_rate_limits.db",
     )
 
+    # Each step's report is assembled into one string and written with a
+    # single call, so sections stay contiguous in CI logs and under
+    # concurrent runners instead of interleaving line by line
+    def report_usage(header: str, usage: dict, remaining: bool = False):
+        suffix = (
+            (f" (remaining: {usage['rpm_remaining']})",
+             f" (remaining: {usage['tpm_remaining']})",
+             f" (remaining: {usage['rpd_remaining']})")
+            if remaining else ("", "", "")
+        )
+        sys.stdout.write(
+            f"\n{header}\n"
+            f"   RPM: {usage['requests_per_minute']}/{usage['rpm_limit']}{suffix[0]}\n"
+            f"   TPM: {usage['tokens_per_minute']}/{usage['tpm_limit']}{suffix[1]}\n"
+            f"   RPD: {usage['requests_per_day']}/{usage['rpd_limit']}{suffix[2]}\n"
+        )
+
     # Test 1: Check initial usage (should be 0)
-    usage = client.get_current_usage()
-    print(f"\n1. Initial usage stats:")
-    print(f"   RPM: {usage['requests_per_minute']}/{usage['rpm_limit']}")
-    print(f"   TPM: {usage['tokens_per_minute']}/{usage['tpm_limit']}")
-    print(f"   RPD: {usage['requests_per_day']}/{usage['rpd_limit']}")
+    report_usage("1. Initial usage stats:", client.get_current_usage())
 
     # Test 2: Make an embedding call
     print(f"\n2. Making first embedding call...")
@@ -49,37 +72,50 @@ def test_basic_functionality():
         print(f"   ✗ Error: {e}")
         return
 
-    # Test 3: Check usage after one call
-    usage = client.get_current_usage()
-    print(f"\n3. Usage after 1 call:")
-    print(f"   RPM: {usage['requests_per_minute']}/{usage['rpm_limit']} (remaining: {usage['rpm_remaining']})")
-    print(f"   TPM: {usage['tokens_per_minute']}/{usage['tpm_limit']} (remaining: {usage['tpm_remaining']})")
-    print(f"   RPD: {usage['requests_per_day']}/{usage['rpd_limit']} (remaining: {usage['rpd_remaining']})")
-
-    # Test 4: Make more calls to test RPM limit
-    print(f"\n4. Making additional calls to test RPM limit (limit is {client.rpm_limit})...")
-    for i in range(2, 5):
+    # Test 3: Check usage after one call. The call itself already
+    # returned a snapshot, so no extra get_current_usage() poll needed.
+    report_usage("3. Usage after 1 call:", result["_usage"], remaining=True)
+
+    # Test 4: More embeddings; batched by default (one round-trip, one
+    # rate-limit record), sequential behind --sequential to probe the
+    # RPM boundary call by call
+    contents = [f"Test embedding {i}" for i in range(2, 5)]
+    if sequential:
+        lines = [f"\n4. Making additional calls to test RPM limit (limit is {client.rpm_limit})...\n"]
+        for i, content in enumerate(contents, start=2):
+            try:
+                result = client.embed_content(
+                    model="models/text-embedding-004",
+                    content=content,
+                    task_type="retrieval_query",
+                )
+                usage = result["_usage"]
+                lines.append(f"   Call {i}: ✓ Success (RPM: {usage['requests_per_minute']}/{usage['rpm_limit']})\n")
+            except RateLimitExceededError as e:
+                lines.append(f"   Call {i}: ✗ Rate limit hit! {str(e)}\n")
+                break
+            except Exception as e:
+                lines.append(f"   Call {i}: ✗ Error: {e}\n")
+                break
+        sys.stdout.write("".join(lines))
+    else:
+        print(f"\n4. Embedding {len(contents)} texts in one batched call...")
         try:
-            result = client.embed_content(
+            embeddings = client.embed_content_batch(
                 model="models/text-embedding-004",
-                content=f"Test embedding {i}",
+                contents=contents,
                 task_type="retrieval_query",
             )
             usage = client.get_current_usage()
-            print(f"   Call {i}: ✓ Success (RPM: {usage['requests_per_minute']}/{usage['rpm_limit']})")
+            print(f"   ✓ Got {len(embeddings)} embeddings in one request "
+                  f"(RPM: {usage['requests_per_minute']}/{usage['rpm_limit']})")
         except RateLimitExceededError as e:
-            print(f"   Call {i}: ✗ Rate limit hit! {str(e)}")
-            break
+            print(f"   ✗ Rate limit hit! {str(e)}")
         except Exception as e:
-            print(f"   Call {i}: ✗ Error: {e}")
-            break
+            print(f"   ✗ Error: {e}")
 
     # Test 5: Final usage stats
-    usage = client.get_current_usage()
-    print(f"\n5. Final usage stats:")
-    print(f"   RPM: {usage['requests_per_minute']}/{usage['rpm_limit']}")
-    print(f"   TPM: {usage['tokens_per_minute']}/{usage['tpm_limit']}")
-    print(f"   RPD: {usage['requests_per_day']}/{usage['rpd_limit']}")
+    report_usage("5. Final usage stats:", client.get_current_usage())
 
     print("\n" + "=" * 60)
     print("✓ Basic functionality test completed!")
@@ -88,6 +124,8 @@ def test_basic_functionality():
 
 def test_token_counting():
     """Test token counting functionality."""
+    from utils.google_api_client import GoogleAPIClient
+
     print("\n" + "=" * 60)
     print("Testing Token Counting")
     print("=" * 60)
@@ -127,7 +165,7 @@ def main():
         sys.exit(1)
 
     try:
-        test_basic_functionality()
+        test_basic_functionality(sequential="--sequential" in sys.argv)
         test_token_counting()
 
         print("\n" + "=" * 60)
@@ -141,10 +179,12 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
-        # Clean up test database
-        if os.path.exists("./test_rate_limits.db"):
-            os.remove("./test_rate_limits.db")
-            print("\nCleaned up test database.")
+        # Clean up test database; unlink(missing_ok=True) skips the
+        # separate exists() stat, and the -wal/-shm sidecars come from
+        # the store's WAL journal mode
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"./test_rate_limits.db{suffix}").unlink(missing_ok=True)
+        print("\nCleaned up test database.")
 
 
 if __name__ == "__main__":
@@ -4,9 +4,11 @@ Unit tests for rate limiting with mocked Google API.
 These tests verify rate limiting behavior without making real API calls.
 """
 
+import asyncio
 import os
 import time
 import tempfile
+from dataclasses import dataclass
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -15,535 +17,465 @@ from utils.google_api_client import GoogleAPIClient, RateLimitExceededError
 from utils.rate_limit_store import RateLimitStore
 
 
+# Slotted stand-ins for Google API response objects: attribute access
+# is a plain slot lookup and each instance is far smaller than a
+# MagicMock with its per-attribute child mocks
+@dataclass(slots=True)
+class StubTokenCount:
+    total_tokens: int
+
+
+@dataclass(slots=True)
+class StubUsageMetadata:
+    prompt_token_count: int
+    candidates_token_count: int
+
+
+@dataclass(slots=True)
+class StubResponse:
+    text: str
+    usage_metadata: StubUsageMetadata
+
+
 class TestRateLimitStore:
     """Test the rate limit storage functionality."""
 
     def test_record_and_retrieve_calls(self):
         """Test recording and retrieving API calls."""
+        store = RateLimitStore(":memory:")
+
+        # Record some calls
+        store.record_call(100, "embed")
+        store.record_call(200, "generate")
+        store.record_call(150, "embed")
+
+        # Check counts
+        assert store.get_request_count_in_window(60) == 3
+        assert store.get_token_count_in_window(60) == 450  # 100 + 200 + 150
+
+    def test_window_queries_use_timestamp_index(self):
+        """Test that the window aggregates run off an index, not a scan."""
+        store = RateLimitStore(":memory:")
+        store.record_call(100, "embed")
+
+        conn = store._get_connection()
+        for query in (
+            "SELECT COUNT(*) FROM api_calls WHERE timestamp > ?",
+            "SELECT COALESCE(SUM(tokens_used), 0) FROM api_calls WHERE timestamp > ?",
+        ):
+            plan = " ".join(
+                row[3] for row in
+                conn.execute(f"EXPLAIN QUERY PLAN {query}", (0,))
+            )
+            assert "USING COVERING INDEX" in plan or "USING INDEX" in plan, plan
+
+    def test_wal_journal_mode(self):
+        """Test that the store's connections run in WAL journal mode."""
         with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
             db_path = tmp.name
 
         try:
             store = RateLimitStore(db_path)
-
-            # Record some calls
             store.record_call(100, "embed")
-            store.record_call(200, "generate")
-            store.record_call(150, "embed")
 
-            # Check counts
-            assert store.get_request_count_in_window(60) == 3
-            assert store.get_token_count_in_window(60) == 450  # 100 + 200 + 150
+            mode = store._get_connection().execute(
+                "PRAGMA journal_mode"
+            ).fetchone()[0]
+            assert mode == "wal"
 
         finally:
             os.unlink(db_path)
 
     def test_sliding_window(self):
         """Test that old records are excluded from window."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
+        # Virtual clock: advancing clock[0] moves the sliding window
+        # forward without any real waiting
+        clock = [time.time()]
+        store = RateLimitStore(":memory:", time_fn=lambda: clock[0])
 
-        try:
-            store = RateLimitStore(db_path)
+        # Get calls from last 1 second (should be 0)
+        count = store.get_request_count_in_window(1)
+        assert count == 0
 
-            # Get calls from last 1 second (should be 0)
-            count = store.get_request_count_in_window(1)
-            assert count == 0
-
-            # Record a call
-            store.record_call(100, "embed")
+        # Record a call
+        store.record_call(100, "embed")
 
-            # Should be in 60s window
-            assert store.get_request_count_in_window(60) == 1
+        # Should be in 60s window
+        assert store.get_request_count_in_window(60) == 1
 
-            # Should be in 1s window
-            assert store.get_request_count_in_window(1) == 1
+        # Should be in 1s window
+        assert store.get_request_count_in_window(1) == 1
 
-            # Wait 2 seconds
-            time.sleep(2)
+        # "Wait" 2 seconds
+        clock[0] += 2
 
-            # Should still be in 60s window
-            assert store.get_request_count_in_window(60) == 1
+        # Should still be in 60s window
+        assert store.get_request_count_in_window(60) == 1
 
-            # Should NOT be in 1s window
-            assert store.get_request_count_in_window(1) == 0
-
-        finally:
-            os.unlink(db_path)
+        # Should NOT be in 1s window
+        assert store.get_request_count_in_window(1) == 0
 
     def test_daily_request_count(self):
         """Test daily request counting."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
+        store = RateLimitStore(":memory:")
 
-        try:
-            store = RateLimitStore(db_path)
+        # Record some calls in one transaction
+        store.record_calls([(100, "embed")] * 5)
 
-            # Record some calls
-            for i in range(5):
-                store.record_call(100, "embed")
-
-            # Check daily count
-            assert store.get_daily_request_count() == 5
-
-        finally:
-            os.unlink(db_path)
+        # Check daily count
+        assert store.get_daily_request_count() == 5
 
     def test_cleanup_old_records(self):
         """Test that old records are cleaned up."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
+        store = RateLimitStore(":memory:")
 
-        try:
-            store = RateLimitStore(db_path)
+        # Record calls
+        store.record_call(100, "embed")
+        store.record_call(200, "generate")
 
-            # Record calls
-            store.record_call(100, "embed")
-            store.record_call(200, "generate")
+        # Should have 2 records
+        assert store.get_request_count_in_window(86400) == 2
 
-            # Should have 2 records
-            assert store.get_request_count_in_window(86400) == 2
+        # Cleanup records older than 0 seconds (all of them)
+        store.cleanup_old_records(keep_seconds=0)
 
-            # Cleanup records older than 0 seconds (all of them)
-            store.cleanup_old_records(keep_seconds=0)
+        # Should have 0 records now
+        assert store.get_request_count_in_window(86400) == 0
 
-            # Should have 0 records now
-            assert store.get_request_count_in_window(86400) == 0
 
-        finally:
-            os.unlink(db_path)
+@pytest.fixture
+def client_factory():
+    """
+    Build GoogleAPIClients backed by in-memory rate-limit stores.
 
+    Fills in the fake API key and an in-memory database path so tests
+    only state the limits they care about. Each client gets its own
+    :memory: store, so tests are isolated without any file handling or
+    cleanup between them.
+    """
+    def factory(**kwargs):
+        kwargs.setdefault("api_key", "fake_key")
+        kwargs.setdefault("rate_limit_db_path", ":memory:")
+        return GoogleAPIClient(**kwargs)
 
+    return factory
+
+
+# One class-level patch installs the genai mock per test via a single
+# decorator instead of six copies; each method still receives its own
+# fresh mock as the first argument after self
+@patch("utils.google_api_client.genai")
 class TestGoogleAPIClient:
     """Test the rate-limited Google API client."""
 
-    @patch("utils.google_api_client.genai")
-    def test_rpm_limit_enforcement(self, mock_genai):
-        """Test that RPM limits are enforced."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
-
-        try:
-            # Mock the API response
-            mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
-
-            # Create client with very low RPM limit
-            client = GoogleAPIClient(
-                api_key="fake_key",
-                rpm_limit=3,
-                tpm_limit=1_000_000,
-                rpd_limit=1000,
-                rate_limit_db_path=db_path,
+    # (limits, contents that fit, content that trips the limit,
+    #  usage/remaining keys, limit value, expected error fragments)
+    LIMIT_CASES = [
+        pytest.param(
+            {"rpm_limit": 3, "tpm_limit": 1_000_000, "rpd_limit": 1000},
+            [f"test {i}" for i in range(3)],
+            "test 3",
+            "requests_per_minute", "rpm_remaining", 3,
+            ["RPM limit exceeded", "3/3 requests"],
+            id="rpm",
+        ),
+        pytest.param(
+            {"rpm_limit": 1000, "tpm_limit": 1_000_000, "rpd_limit": 5},
+            [f"test {i}" for i in range(5)],
+            "test 5",
+            "requests_per_day", "rpd_remaining", 5,
+            ["RPD limit exceeded", "5/5 requests"],
+            id="rpd",
+        ),
+        pytest.param(
+            {"rpm_limit": 1000, "tpm_limit": 100, "rpd_limit": 1000},
+            ["a" * 200],  # ~50 tokens (200 chars / 4)
+            "a" * 300,  # ~75 tokens; 50 + 75 = 125 > 100
+            "tokens_per_minute", "tpm_remaining", 100,
+            [
+                "TPM limit exceeded",
+                "125/100",
+                "Current usage: 50 tokens",
+                "Requested: 75 tokens",
+            ],
+            id="tpm",
+        ),
+    ]
+
+    @pytest.mark.parametrize(
+        "limits,contents,failing_content,usage_key,remaining_key,limit,expected_msgs",
+        LIMIT_CASES,
+    )
+    def test_limit_enforcement(
+        self, mock_genai, client_factory,
+        limits, contents, failing_content,
+        usage_key, remaining_key, limit, expected_msgs,
+    ):
+        """Test that RPM/RPD/TPM limits are enforced before the API call."""
+        # Mock the API response
+        mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
+
+        client = client_factory(**limits)
+
+        # Verify initial state - nothing used
+        usage = client.get_current_usage()
+        assert usage[usage_key] == 0
+        assert usage[remaining_key] == limit
+
+        # Make calls up to the limit (should succeed)
+        used = 0
+        for content in contents:
+            result = client.embed_content(
+                model="models/text-embedding-004",
+                content=content,
             )
+            assert result["embedding"] is not None
 
-            # Verify initial state - no requests
-            usage = client.get_current_usage()
-            assert usage["requests_per_minute"] == 0
-            assert usage["rpm_remaining"] == 3
-
-            # Make 3 calls (should succeed - exactly at limit)
-            for i in range(3):
-                result = client.embed_content(
-                    model="models/text-embedding-004",
-                    content=f"test {i}",
-                )
-                assert result["embedding"] is not None
-
-                # Verify the call was tracked
-                usage = client.get_current_usage()
-                assert usage["requests_per_minute"] == i + 1
-                assert usage["rpm_remaining"] == 3 - (i + 1)
-
-            # Verify we're at the limit
-            usage = client.get_current_usage()
-            assert usage["requests_per_minute"] == 3
-            assert usage["rpm_remaining"] == 0
+            # Requests count 1 per call; tokens count the estimate
+            used += 1 if usage_key.startswith("requests") else max(1, len(content) // 4)
 
-            # Verify the mock was called exactly 3 times
-            assert mock_genai.embed_content.call_count == 3
+            # Verify tracking via the returned usage snapshot
+            usage = result["_usage"]
+            assert usage[usage_key] == used
+            assert usage[remaining_key] == limit - used
 
-            # 4th call should fail with RPM limit BEFORE calling the API
-            call_count_before = mock_genai.embed_content.call_count
-            with pytest.raises(RateLimitExceededError) as exc_info:
-                client.embed_content(
-                    model="models/text-embedding-004",
-                    content="test 4",
-                )
-
-            # Verify the mock was NOT called (rate limit check happened first)
-            assert mock_genai.embed_content.call_count == call_count_before
-
-            # Verify error message
-            assert "RPM limit exceeded" in str(exc_info.value)
-            assert "3/3 requests" in str(exc_info.value)
-            assert exc_info.value.reset_time > time.time()
-
-            # Verify usage is still at 3
-            usage = client.get_current_usage()
-            assert usage["requests_per_minute"] == 3
-
-        finally:
-            os.unlink(db_path)
-
-    @patch("utils.google_api_client.genai")
-    def test_rpd_limit_enforcement(self, mock_genai):
-        """Test that RPD limits are enforced."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
+        # Verify the mock was called once per allowed request
+        assert mock_genai.embed_content.call_count == len(contents)
 
-        try:
-            # Mock the API response
-            mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
-
-            # Create client with very low RPD limit
-            client = GoogleAPIClient(
-                api_key="fake_key",
-                rpm_limit=1000,
-                tpm_limit=1_000_000,
-                rpd_limit=5,  # Very low daily limit
-                rate_limit_db_path=db_path,
+        # The next call should fail BEFORE calling the API
+        call_count_before = mock_genai.embed_content.call_count
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            client.embed_content(
+                model="models/text-embedding-004",
+                content=failing_content,
             )
 
-            # Verify initial state
-            usage = client.get_current_usage()
-            assert usage["requests_per_day"] == 0
-            assert usage["rpd_remaining"] == 5
+        # Verify the mock was NOT called (rate limit check happened first)
+        assert mock_genai.embed_content.call_count == call_count_before
 
-            # Make 5 calls (should succeed)
-            for i in range(5):
-                result = client.embed_content(
-                    model="models/text-embedding-004",
-                    content=f"test {i}",
-                )
-                assert result["embedding"] is not None
+        # Verify error message (formatted once)
+        msg = str(exc_info.value)
+        for expected in expected_msgs:
+            assert expected in msg
+        assert exc_info.value.reset_time > time.time()
 
-                # Verify daily count increases
-                usage = client.get_current_usage()
-                assert usage["requests_per_day"] == i + 1
-                assert usage["rpd_remaining"] == 5 - (i + 1)
+        # Verify usage did not change after the rejected call
+        usage = client.get_current_usage()
+        assert usage[usage_key] == used
 
-            # Verify we're at the daily limit
-            usage = client.get_current_usage()
-            assert usage["requests_per_day"] == 5
-            assert usage["rpd_remaining"] == 0
+    def test_get_current_usage(self, mock_genai, client_factory):
+        """Test usage statistics retrieval."""
+        # Mock the API response
+        mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
+
+        client = client_factory(
+            rpm_limit=15,
+            tpm_limit=250000,
+            rpd_limit=1000,
+        )
+
+        # Initial usage should be 0
+        usage = client.get_current_usage()
+        assert usage["requests_per_minute"] == 0
+        assert usage["tokens_per_minute"] == 0
+        assert usage["requests_per_day"] == 0
+        assert usage["rpm_remaining"] == 15
+        assert usage["rpd_remaining"] == 1000
+
+        # Make one call
+        client.embed_content(
+            model="models/text-embedding-004",
+            content="test",
+        )
+
+        # Usage should update
+        usage = client.get_current_usage()
+        assert usage["requests_per_minute"] == 1
+        assert usage["tokens_per_minute"] > 0  # Should have some tokens
+        assert usage["requests_per_day"] == 1
+        assert usage["rpm_remaining"] == 14
+        assert usage["rpd_remaining"] == 999
+
+    def test_generate_content_with_usage_metadata(self, mock_genai, client_factory):
+        """Test generation with actual token counts from response."""
+        # Mock the model; the stub objects it returns are slotted
+        # dataclasses, so attribute access in the code under test never
+        # hits MagicMock's __getattr__ machinery
+        mock_model = MagicMock()
+        mock_model.count_tokens.return_value = StubTokenCount(total_tokens=10)
+        mock_model.generate_content.return_value = StubResponse(
+            text="Generated response",
+            usage_metadata=StubUsageMetadata(
+                prompt_token_count=10,
+                candidates_token_count=15,
+            ),
+        )
+        mock_genai.GenerativeModel.return_value = mock_model
+
+        client = client_factory(
+            rpm_limit=100,
+            tpm_limit=10000,
+            rpd_limit=1000,
+        )
+
+        # Generate content
+        response = client.generate_content(
+            model_name="gemini-1.5-flash",
+            prompt="Test prompt",
+        )
+
+        assert response.text == "Generated response"
+
+        # Check that tokens were tracked (should be 10 + 15 = 25)
+        usage = client.get_current_usage()
+        assert usage["tokens_per_minute"] == 25
+
+    def test_token_counting(self, mock_genai, client_factory):
+        """Test token counting functionality."""
+        # Mock the model
+        mock_model = MagicMock()
+        mock_model.count_tokens.return_value = StubTokenCount(total_tokens=42)
+        mock_genai.GenerativeModel.return_value = mock_model
 
-            # Verify the mock was called exactly 5 times
-            assert mock_genai.embed_content.call_count == 5
+        client = client_factory(
+            rpm_limit=100,
+            tpm_limit=10000,
+            rpd_limit=1000,
+        )
 
-            # 6th call should fail with RPD limit BEFORE calling the API
-            call_count_before = mock_genai.embed_content.call_count
-            with pytest.raises(RateLimitExceededError) as exc_info:
-                client.embed_content(
-                    model="models/text-embedding-004",
-                    content="test 6",
-                )
+        # Count tokens
+        count = client.count_tokens("gemini-1.5-flash", "Test content")
+        assert count == 42
 
-            # Verify the mock was NOT called (rate limit check happened first)
-            assert mock_genai.embed_content.call_count == call_count_before
+        # Test with list
+        mock_model.count_tokens.return_value = StubTokenCount(total_tokens=10)
+        count = client.count_tokens("gemini-1.5-flash", ["test1", "test2", "test3"])
+        assert count == 30  # 10 tokens × 3 items
 
-            # Verify error message
-            assert "RPD limit exceeded" in str(exc_info.value)
-            assert "5/5 requests" in str(exc_info.value)
 
-        finally:
-            os.unlink(db_path)
+    def test_sliding_window_reset(self, mock_genai, client_factory):
+        """Test that rate limits reset as the sliding window moves."""
+        # Mock the API response
+        mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
 
-    @patch("utils.google_api_client.genai")
-    def test_tpm_limit_enforcement(self, mock_genai):
-        """Test that TPM limits are enforced."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
+        # Create client with 2 requests per 3 seconds (very short window for testing)
+        client = client_factory(
+            rpm_limit=1000,  # High enough to not interfere
+            tpm_limit=1_000_000,
+            rpd_limit=1000,
+        )
 
-        try:
-            # Mock the API response
-            mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
-
-            # Create client with very low TPM limit
-            client = GoogleAPIClient(
-                api_key="fake_key",
-                rpm_limit=1000,
-                tpm_limit=100,  # Very low token limit
-                rpd_limit=1000,
-                rate_limit_db_path=db_path,
-            )
+        # Virtual clock on the client's store: advancing clock[0]
+        # moves the sliding window forward without real waiting
+        clock = [time.time()]
+        client.store._now = lambda: clock[0]
 
-            # Verify initial state
-            usage = client.get_current_usage()
-            assert usage["tokens_per_minute"] == 0
-            assert usage["tpm_remaining"] == 100
+        # We'll make 2 calls, "wait" 3.5 seconds, then make 2 more
 
-            # Make a few small calls first (consume ~50 tokens)
-            small_text = "a" * 200  # ~50 tokens (200 chars / 4)
+        # Make 2 calls
+        for i in range(2):
             client.embed_content(
                 model="models/text-embedding-004",
-                content=small_text,
+                content=f"test {i}",
             )
 
-            # Verify tokens were tracked
-            usage = client.get_current_usage()
-            assert usage["tokens_per_minute"] == 50
-            assert usage["tpm_remaining"] == 50
-
-            # Verify the mock was called once
-            assert mock_genai.embed_content.call_count == 1
+        # Verify 2 requests in last 60 seconds
+        assert client.store.get_request_count_in_window(60) == 2
 
-            # Try to make a call with text that would exceed limit
-            # Current: 50 tokens, Limit: 100, New request: ~75 tokens
-            # Total would be 125 > 100, so should fail
-            medium_text = "a" * 300  # ~75 tokens (300 chars / 4)
+        # "Wait" for 3.5 seconds
+        clock[0] += 3.5
 
-            call_count_before = mock_genai.embed_content.call_count
-            with pytest.raises(RateLimitExceededError) as exc_info:
-                client.embed_content(
-                    model="models/text-embedding-004",
-                    content=medium_text,
-                )
-
-            # Verify the mock was NOT called (rate limit check happened first)
-            assert mock_genai.embed_content.call_count == call_count_before
-
-            # Verify error message
-            assert "TPM limit exceeded" in str(exc_info.value)
-            assert "125/100" in str(exc_info.value)  # 50 current + 75 requested
-            assert "Current usage: 50 tokens" in str(exc_info.value)
-            assert "Requested: 75 tokens" in str(exc_info.value)
-
-            # Verify token count didn't change
-            usage = client.get_current_usage()
-            assert usage["tokens_per_minute"] == 50
-
-        finally:
-            os.unlink(db_path)
-
-    @patch("utils.google_api_client.genai")
-    def test_get_current_usage(self, mock_genai):
-        """Test usage statistics retrieval."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
-
-        try:
-            # Mock the API response
-            mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
-
-            client = GoogleAPIClient(
-                api_key="fake_key",
-                rpm_limit=15,
-                tpm_limit=250000,
-                rpd_limit=1000,
-                rate_limit_db_path=db_path,
-            )
-
-            # Initial usage should be 0
-            usage = client.get_current_usage()
-            assert usage["requests_per_minute"] == 0
-            assert usage["tokens_per_minute"] == 0
-            assert usage["requests_per_day"] == 0
-            assert usage["rpm_remaining"] == 15
-            assert usage["rpd_remaining"] == 1000
-
-            # Make one call
+        # Make 2 more calls
+        for i in range(2, 4):
             client.embed_content(
                 model="models/text-embedding-004",
-                content="test",
+                content=f"test {i}",
             )
 
-            # Usage should update
-            usage = client.get_current_usage()
-            assert usage["requests_per_minute"] == 1
-            assert usage["tokens_per_minute"] > 0  # Should have some tokens
-            assert usage["requests_per_day"] == 1
-            assert usage["rpm_remaining"] == 14
-            assert usage["rpd_remaining"] == 999
+        # Should have 4 requests total in last 60 seconds
+        assert client.store.get_request_count_in_window(60) == 4
 
-        finally:
-            os.unlink(db_path)
+        # But only 2 requests in the last 3 seconds (the new ones)
+        assert client.store.get_request_count_in_window(3) == 2
 
-    @patch("utils.google_api_client.genai")
-    def test_generate_content_with_usage_metadata(self, mock_genai):
-        """Test generation with actual token counts from response."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
-
-        try:
-            # Mock the model and response
-            mock_model = MagicMock()
-            mock_response = MagicMock()
-
-            # Mock token counting
-            mock_count_result = MagicMock()
-            mock_count_result.total_tokens = 10
-            mock_model.count_tokens.return_value = mock_count_result
-
-            # Mock response with usage metadata
-            mock_response.text = "Generated response"
-            mock_response.usage_metadata = MagicMock()
-            mock_response.usage_metadata.prompt_token_count = 10
-            mock_response.usage_metadata.candidates_token_count = 15
-
-            mock_model.generate_content.return_value = mock_response
-            mock_genai.GenerativeModel.return_value = mock_model
-
-            client = GoogleAPIClient(
-                api_key="fake_key",
-                rpm_limit=100,
-                tpm_limit=10000,
-                rpd_limit=1000,
-                rate_limit_db_path=db_path,
-            )
-
-            # Generate content
-            response = client.generate_content(
-                model_name="gemini-1.5-flash",
-                prompt="Test prompt",
-            )
-
-            assert response.text == "Generated response"
+        # Verify the mock was called 4 times total
+        assert mock_genai.embed_content.call_count == 4
 
-            # Check that tokens were tracked (should be 10 + 15 = 25)
-            usage = client.get_current_usage()
-            assert usage["tokens_per_minute"] == 25
-
-        finally:
-            os.unlink(db_path)
-
-    @patch("utils.google_api_client.genai")
-    def test_token_counting(self, mock_genai):
-        """Test token counting functionality."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
-
-        try:
-            # Mock the model
-            mock_model = MagicMock()
-            mock_count_result = MagicMock()
-            mock_count_result.total_tokens = 42
-            mock_model.count_tokens.return_value = mock_count_result
-            mock_genai.GenerativeModel.return_value = mock_model
-
-            client = GoogleAPIClient(
-                api_key="fake_key",
-                rpm_limit=100,
-                tpm_limit=10000,
-                rpd_limit=1000,
-                rate_limit_db_path=db_path,
+    def test_rpm_limit_with_sliding_window(self, mock_genai, client_factory):
+        """Test that RPM limits properly reset with sliding window."""
+        # Mock the API response
+        mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
+
+        # Create client with 2 RPM limit
+        client = client_factory(
+            rpm_limit=2,
+            tpm_limit=1_000_000,
+            rpd_limit=1000,
+        )
+
+        # Make 2 calls (hit the limit)
+        for i in range(2):
+            client.embed_content(
+                model="models/text-embedding-004",
+                content=f"test {i}",
             )
 
-            # Count tokens
-            count = client.count_tokens("gemini-1.5-flash", "Test content")
-            assert count == 42
-
-            # Test with list
-            mock_model.count_tokens.return_value.total_tokens = 10
-            count = client.count_tokens("gemini-1.5-flash", ["test1", "test2", "test3"])
-            assert count == 30  # 10 tokens × 3 items
-
-        finally:
-            os.unlink(db_path)
-
-
-    @patch("utils.google_api_client.genai")
-    def test_sliding_window_reset(self, mock_genai):
-        """Test that rate limits reset as the sliding window moves."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
-
-        try:
-            # Mock the API response
-            mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
-
-            # Create client with 2 requests per 3 seconds (very short window for testing)
-            client = GoogleAPIClient(
-                api_key="fake_key",
-                rpm_limit=1000,  # High enough to not interfere
-                tpm_limit=1_000_000,
-                rpd_limit=1000,
-                rate_limit_db_path=db_path,
+        # 3rd call should fail
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            client.embed_content(
+                model="models/text-embedding-004",
+                content="test 2",
             )
+        assert "RPM limit exceeded" in str(exc_info.value)
 
-            # Manually set up the store to use a 3-second window for testing
-            # We'll make 2 calls, wait 3.5 seconds, then make 2 more
+        # Verify mock was called exactly 2 times (not 3)
+        assert mock_genai.embed_content.call_count == 2
 
-            # Make 2 calls
-            for i in range(2):
-                client.embed_content(
-                    model="models/text-embedding-004",
-                    content=f"test {i}",
-                )
+        # Wait for 61 seconds (more than 60 second window)
+        # In real test we'd use time mocking, but for simplicity
+        # we'll just verify the store behavior
+        # Simulate by manually checking the window
+        original_count = client.store.get_request_count_in_window(60)
+        assert original_count == 2
 
-            # Verify 2 requests in last 60 seconds
-            assert client.store.get_request_count_in_window(60) == 2
+        # After 61 seconds, those requests would be outside the window
+        # and new requests could be made (we test this with the store test above)
 
-            # Wait for 3.5 seconds
-            time.sleep(3.5)
 
-            # Make 2 more calls
-            for i in range(2, 4):
-                client.embed_content(
-                    model="models/text-embedding-004",
-                    content=f"test {i}",
-                )
-
-            # Should have 4 requests total in last 60 seconds
-            assert client.store.get_request_count_in_window(60) == 4
-
-            # But only 2 requests in the last 3 seconds (the new ones)
-            assert client.store.get_request_count_in_window(3) == 2
+    def test_aembed_batch_waits_instead_of_raising(self, mock_genai, client_factory):
+        """Test that the async embed path waits for a slot rather than failing."""
+        mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
 
-            # Verify the mock was called 4 times total
-            assert mock_genai.embed_content.call_count == 4
-
-        finally:
-            os.unlink(db_path)
-
-    @patch("utils.google_api_client.genai")
-    def test_rpm_limit_with_sliding_window(self, mock_genai):
-        """Test that RPM limits properly reset with sliding window."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-            db_path = tmp.name
+        client = client_factory(
+            rpm_limit=2,
+            tpm_limit=1_000_000,
+            rpd_limit=1000,
+        )
 
-        try:
-            # Mock the API response
-            mock_genai.embed_content.return_value = {"embedding": [0.1] * 768}
-
-            # Create client with 2 RPM limit
-            client = GoogleAPIClient(
-                api_key="fake_key",
-                rpm_limit=2,
-                tpm_limit=1_000_000,
-                rpd_limit=1000,
-                rate_limit_db_path=db_path,
-            )
+        sleeps = []
 
-            # Make 2 calls (hit the limit)
-            for i in range(2):
-                client.embed_content(
-                    model="models/text-embedding-004",
-                    content=f"test {i}",
-                )
+        async def fake_sleep(wait):
+            # Stand in for the window rolling forward: drop the old
+            # records so the retry finds a free slot
+            sleeps.append(wait)
+            client.store.cleanup_old_records(keep_seconds=0)
 
-            # 3rd call should fail
-            with pytest.raises(RateLimitExceededError) as exc_info:
-                client.embed_content(
+        async def run():
+            with patch("utils.google_api_client.asyncio.sleep", fake_sleep):
+                return await client.aembed_batch(
                     model="models/text-embedding-004",
-                    content="test 2",
+                    contents=[f"test {i}" for i in range(4)],
                 )
-            assert "RPM limit exceeded" in str(exc_info.value)
 
-            # Verify mock was called exactly 2 times (not 3)
-            assert mock_genai.embed_content.call_count == 2
+        results = asyncio.run(run())
 
-            # Wait for 61 seconds (more than 60 second window)
-            # In real test we'd use time mocking, but for simplicity
-            # we'll just verify the store behavior
-            # Simulate by manually checking the window
-            original_count = client.store.get_request_count_in_window(60)
-            assert original_count == 2
-
-            # After 61 seconds, those requests would be outside the window
-            # and new requests could be made (we test this with the store test above)
-
-        finally:
-            os.unlink(db_path)
+        # All four embeds completed despite the 2-RPM limit, and the
+        # ones over the limit waited instead of raising
+        assert len(results) == 4
+        assert all(r["embedding"] is not None for r in results)
+        assert mock_genai.embed_content.call_count == 4
+        assert len(sleeps) >= 1
+        assert all(wait >= 0 for wait in sleeps)
 
 
 if __name__ == "__main__":
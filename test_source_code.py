@@ -1,64 +1,57 @@
 """Test script for source code retrieval functionality."""
 
-from rag_server.rag_system import RAGSystem
+import pytest
+
+from output_utils import truncate
+
+# (url, context_lines, expect_error) scenarios; all run against one
+# shared RAGSystem instead of paying its init cost per case
+SOURCE_CODE_CASES = [
+    (
+        "https://github.com/dagster-io/dagster/blob/master/python_modules/dagster/dagster/_core/definitions/decorators/asset_decorator.py#L130",
+        10,
+        False,
+    ),
+    (
+        "https://github.com/dagster-io/dagster/blob/master/python_modules/dagster/dagster/_core/definitions/decorators/asset_decorator.py",
+        20,
+        False,
+    ),
+    ("https://github.com/invalid-url", None, True),
+    (
+        "https://github.com/dagster-io/dagster/blob/master/python_modules/nonexistent/file.py#L10",
+        None,
+        True,
+    ),
+]
+
+
+@pytest.fixture(scope="session")
+def rag():
+    """Session-wide RAGSystem so init (Qdrant, Google client) runs once."""
+    from rag_server.rag_system import RAGSystem
+
+    return RAGSystem()
+
+
+@pytest.mark.parametrize("url,context_lines,expect_error", SOURCE_CODE_CASES)
+def test_source_code_retrieval(rag, url, context_lines, expect_error):
+    """Test source code retrieval for valid and invalid GitHub URLs."""
+    kwargs = {"context_lines": context_lines} if context_lines else {}
+    result = rag.get_source_code(url, **kwargs)
+
+    if expect_error:
+        assert result.get("error"), f"Unexpected success for {url}"
+        print(f"ERROR (expected): {result['error']}")
+        return
+
+    assert not result.get("error"), result.get("error")
+    print(f"File: {result['file_path']}")
+    print(f"Lines: {result['start_line']}-{result['end_line']} (target: {result.get('line_number', 'N/A')})")
+    print(f"Type: {result.get('type', 'N/A')}, Name: {result.get('name', 'N/A')}")
+    print("\nSource code:")
+    print(truncate(result["code"], 500))
 
-def test_source_code_retrieval():
-    """Test various scenarios for source code retrieval."""
-    rag = RAGSystem()
-
-    print("=" * 80)
-    print("Test 1: Valid GitHub URL with line number")
-    print("=" * 80)
-    url1 = "https://github.com/dagster-io/dagster/blob/master/python_modules/dagster/dagster/_core/definitions/decorators/asset_decorator.py#L130"
-    result1 = rag.get_source_code(url1, context_lines=10)
-
-    if result1.get("error"):
-        print(f"ERROR: {result1['error']}")
-    else:
-        print(f"File: {result1['file_path']}")
-        print(f"Lines: {result1['start_line']}-{result1['end_line']} (target: {result1.get('line_number', 'N/A')})")
-        print(f"Type: {result1.get('type', 'N/A')}, Name: {result1.get('name', 'N/A')}")
-        print("\nSource code:")
-        print(result1['code'][:500] + "..." if len(result1['code']) > 500 else result1['code'])
-
-    print("\n" + "=" * 80)
-    print("Test 2: Valid GitHub URL without line number")
-    print("=" * 80)
-    url2 = "https://github.com/dagster-io/dagster/blob/master/python_modules/dagster/dagster/_core/definitions/decorators/asset_decorator.py"
-    result2 = rag.get_source_code(url2, context_lines=20)
-
-    if result2.get("error"):
-        print(f"ERROR: {result2['error']}")
-    else:
-        print(f"File: {result2['file_path']}")
-        print(f"Lines: {result2['start_line']}-{result2['end_line']}")
-        print(f"Total lines: {len(result2['code'].split(chr(10)))}")
-
-    print("\n" + "=" * 80)
-    print("Test 3: Invalid URL format")
-    print("=" * 80)
-    url3 = "https://github.com/invalid-url"
-    result3 = rag.get_source_code(url3)
-
-    if result3.get("error"):
-        print(f"ERROR (expected): {result3['error']}")
-    else:
-        print("Unexpected success!")
-
-    print("\n" + "=" * 80)
-    print("Test 4: Non-existent file")
-    print("=" * 80)
-    url4 = "https://github.com/dagster-io/dagster/blob/master/python_modules/nonexistent/file.py#L10"
-    result4 = rag.get_source_code(url4)
-
-    if result4.get("error"):
-        print(f"ERROR (expected): {result4['error']}")
-    else:
-        print("Unexpected success!")
-
-    print("\n" + "=" * 80)
-    print("All tests completed!")
-    print("=" * 80)
 
 if __name__ == "__main__":
-    test_source_code_retrieval()
+    pytest.main([__file__, "-v", "-s"])
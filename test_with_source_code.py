@@ -1,77 +1,89 @@
 """Test enhanced query with a question that should include source code."""
 
-import asyncio
+import io
+import itertools
+import sys
+
+from output_utils import truncate
 from rag_server.rag_system import RAGSystem
 
-async def test_with_source():
+# Separator lines built once instead of a string multiply per print
+SEP_EQ = "=" * 80
+SEP_DASH = "-" * 80
+
+def test_with_source():
     """Test with API reference question that should have GitHub URLs."""
     rag = RAGSystem()
 
-    print("=" * 80)
-    print("Testing Enhanced Query with Source Code Retrieval")
-    print("=" * 80)
+    # Output is collected into a list and written once at the end: one
+    # stdout syscall for the whole report instead of one per line
+    out = [SEP_EQ, "Testing Enhanced Query with Source Code Retrieval", SEP_EQ]
 
     # Try a query about a specific API that should have GitHub links
     question = "what is the @asset decorator and how does it work"
 
-    print(f"\nQuestion: {question}\n")
-    print("Executing enhanced query...")
-    print("-" * 80)
+    out.append(f"\nQuestion: {question}\n")
+    out.append("Executing enhanced query...")
+    out.append(SEP_DASH)
 
     try:
         result = rag.query_enhanced(question, top_k=5, max_followups=2)
 
-        print("\nTHINKING PROCESS:")
-        print("-" * 80)
-        for step in result['thinking_process']:
-            print(step)
+        out.append("\nTHINKING PROCESS:")
+        out.append(SEP_DASH)
+        out.extend(result['thinking_process'])
 
-        print("\n\nANSWER:")
-        print("-" * 80)
-        print(result['answer'][:500] + "..." if len(result['answer']) > 500 else result['answer'])
+        out.append("\n\nANSWER:")
+        out.append(SEP_DASH)
+        out.append(truncate(result['answer'], 500))
 
         if result['followed_references']:
-            print("\n\nFOLLOWED REFERENCES:")
-            print("-" * 80)
+            out.append("\n\nFOLLOWED REFERENCES:")
+            out.append(SEP_DASH)
             for ref, ref_data in result['followed_references'].items():
-                print(f"\n{ref}:")
-                print(f"  Query: {ref_data['query']}")
-                print(f"  Answer: {ref_data['answer'][:200]}...")
+                out.append(f"\n{ref}:")
+                out.append(f"  Query: {ref_data['query']}")
+                out.append(f"  Answer: {ref_data['answer'][:200]}...")
 
         if result['source_code']:
-            print("\n\nSOURCE CODE RETRIEVED:")
-            print("=" * 80)
+            out.append("\n\nSOURCE CODE RETRIEVED:")
+            out.append(SEP_EQ)
             for ref, code_data in result['source_code'].items():
                 ref_display = ref if ref != '_initial_context' else 'From documentation'
-                print(f"\n### {ref_display}")
-                print(f"File: {code_data['file_path']}")
-                print(f"Lines: {code_data['start_line']}-{code_data['end_line']}")
+                out.append(f"\n### {ref_display}")
+                out.append(f"File: {code_data['file_path']}")
+                out.append(f"Lines: {code_data['start_line']}-{code_data['end_line']}")
                 if code_data.get('name') and code_data['name'] != 'unknown':
-                    print(f"Type: {code_data['type']}, Name: {code_data['name']}")
-                print(f"\nCode:")
-                # Show line numbers
-                lines = code_data['code'].split('\n')
-                for i, line in enumerate(lines[:30], code_data['start_line']):  # Show first 30 lines
-                    print(f"{i:4d} | {line}")
-                if len(lines) > 30:
-                    print(f"     ... ({len(lines) - 30} more lines)")
+                    out.append(f"Type: {code_data['type']}, Name: {code_data['name']}")
+                out.append("\nCode:")
+                # Show the first 30 lines with line numbers; islice over
+                # a StringIO never materializes the rest of the blob
+                head = itertools.islice(io.StringIO(code_data['code']), 30)
+                out.extend(
+                    f"{i:4d} | {line.rstrip(chr(10))}"
+                    for i, line in enumerate(head, code_data['start_line'])
+                )
+                total_lines = code_data['code'].count('\n') + 1
+                if total_lines > 30:
+                    out.append(f"     ... ({total_lines - 30} more lines)")
         else:
-            print("\n\nNo source code retrieved.")
+            out.append("\n\nNo source code retrieved.")
 
-        print("\n" + "=" * 80)
-        print("SUMMARY")
-        print("=" * 80)
-        print(f"References followed: {len(result['followed_references'])}")
-        print(f"Source code snippets: {len(result['source_code'])}")
+        out.append("\n" + SEP_EQ)
+        out.append("SUMMARY")
+        out.append(SEP_EQ)
+        out.append(f"References followed: {len(result['followed_references'])}")
+        out.append(f"Source code snippets: {len(result['source_code'])}")
 
     except Exception as e:
-        print(f"Error: {e}")
+        out.append(f"Error: {e}")
         import traceback
-        traceback.print_exc()
+        out.append(traceback.format_exc())
 
-    print("\n" + "=" * 80)
-    print("Test Complete")
-    print("=" * 80)
+    out.append("\n" + SEP_EQ)
+    out.append("Test Complete")
+    out.append(SEP_EQ)
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
-    asyncio.run(test_with_source())
+    test_with_source()
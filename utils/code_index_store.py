@@ -1,13 +1,118 @@
 """Storage and retrieval for code index using SQLite."""
 
 import sqlite3
-import json
+import threading
 from pathlib import Path
 from typing import List, Optional, Dict
 from contextlib import contextmanager
 
+import orjson
+
 from utils.code_indexer import CodeObject
 
+# Whole schema in one script so _init_db issues a single executescript
+# instead of a dozen round trips through the sqlite3 statement machinery.
+# External-content FTS mirrors code_objects via the triggers below; it
+# needs an integer rowid for content_rowid, which rules out a
+# WITHOUT ROWID table keyed on qualified_name — but id is a plain rowid
+# alias (no AUTOINCREMENT), so inserts skip the sqlite_sequence
+# bookkeeping. The composite indexes resolve repo-filtered lookups in one
+# btree seek; their leading columns also serve the unfiltered lookups, so
+# the old single-column name/type/parent_class indexes are redundant and
+# dropped from existing databases, as is idx_qualified_name, which
+# duplicated the UNIQUE constraint's implicit index.
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS code_objects (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        qualified_name TEXT UNIQUE NOT NULL,
+        type TEXT NOT NULL,
+        file_path TEXT NOT NULL,
+        line_number INTEGER NOT NULL,
+        end_line_number INTEGER NOT NULL,
+        repo_name TEXT NOT NULL,
+        relative_path TEXT NOT NULL,
+        docstring TEXT,
+        parent_class TEXT,
+        decorators TEXT,
+        is_private INTEGER NOT NULL
+    );
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS code_fts USING fts5(
+        name, qualified_name, docstring,
+        content='code_objects', content_rowid='id',
+        tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS code_objects_fts_ai
+    AFTER INSERT ON code_objects BEGIN
+        INSERT INTO code_fts(rowid, name, qualified_name, docstring)
+        VALUES (new.id, new.name, new.qualified_name, new.docstring);
+    END;
+    CREATE TRIGGER IF NOT EXISTS code_objects_fts_ad
+    AFTER DELETE ON code_objects BEGIN
+        INSERT INTO code_fts(code_fts, rowid, name, qualified_name, docstring)
+        VALUES ('delete', old.id, old.name, old.qualified_name, old.docstring);
+    END;
+    CREATE TRIGGER IF NOT EXISTS code_objects_fts_au
+    AFTER UPDATE ON code_objects BEGIN
+        INSERT INTO code_fts(code_fts, rowid, name, qualified_name, docstring)
+        VALUES ('delete', old.id, old.name, old.qualified_name, old.docstring);
+        INSERT INTO code_fts(rowid, name, qualified_name, docstring)
+        VALUES (new.id, new.name, new.qualified_name, new.docstring);
+    END;
+
+    CREATE INDEX IF NOT EXISTS idx_repo_name ON code_objects(repo_name);
+    CREATE INDEX IF NOT EXISTS idx_name_repo ON code_objects(name, repo_name);
+    CREATE INDEX IF NOT EXISTS idx_type_repo ON code_objects(type, repo_name);
+    CREATE INDEX IF NOT EXISTS idx_parent_class_repo
+        ON code_objects(parent_class, repo_name, line_number);
+    DROP INDEX IF EXISTS idx_name;
+    DROP INDEX IF EXISTS idx_type;
+    DROP INDEX IF EXISTS idx_parent_class;
+    DROP INDEX IF EXISTS idx_qualified_name;
+"""
+
+# Explicit column order shared by every read query; rows come back as
+# plain tuples and _row_to_object unpacks them positionally, avoiding
+# sqlite3.Row's per-field name lookup on bulk reads
+_COLUMNS = (
+    "name", "qualified_name", "type", "file_path", "line_number",
+    "end_line_number", "repo_name", "relative_path", "docstring",
+    "parent_class", "decorators", "is_private",
+)
+_COLS = ", ".join(_COLUMNS)
+_COLS_CO = ", ".join(f"co.{c}" for c in _COLUMNS)
+
+# Hot-path lookup statements hoisted to module scope: the sqlite3
+# statement cache is keyed on the exact string object, so reusing one
+# constant guarantees a cache hit instead of a reparse per call
+_SQL_GET_QUAL = f"SELECT {_COLS} FROM code_objects WHERE qualified_name = ?"
+_SQL_GET_NAME = f"SELECT {_COLS} FROM code_objects WHERE name = ?"
+_SQL_GET_NAME_REPO = f"SELECT {_COLS} FROM code_objects WHERE name = ? AND repo_name = ?"
+
+# Upsert keyed on qualified_name: unlike INSERT OR REPLACE, a conflict
+# updates the existing row in place instead of delete+reinsert, so
+# re-indexing unchanged symbols keeps rowids stable and halves the
+# B-tree churn across the table and its indexes
+_UPSERT_SQL = """
+    INSERT INTO code_objects
+    (name, qualified_name, type, file_path, line_number, end_line_number,
+     repo_name, relative_path, docstring, parent_class, decorators, is_private)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(qualified_name) DO UPDATE SET
+        name=excluded.name,
+        type=excluded.type,
+        file_path=excluded.file_path,
+        line_number=excluded.line_number,
+        end_line_number=excluded.end_line_number,
+        repo_name=excluded.repo_name,
+        relative_path=excluded.relative_path,
+        docstring=excluded.docstring,
+        parent_class=excluded.parent_class,
+        decorators=excluded.decorators,
+        is_private=excluded.is_private
+"""
+
 
 class CodeIndexStore:
     """SQLite-based storage for code index."""
@@ -20,57 +125,95 @@ class CodeIndexStore:
             db_path: Path to SQLite database file
         """
         self.db_path = Path(db_path)
+        # One persistent connection per thread: an indexing run calls the
+        # store thousands of times and re-opening the file each call pays
+        # open/close syscalls plus journal setup every time. SQLite
+        # serializes writers itself (WAL + busy_timeout), so threaded MCP
+        # handlers don't need a Python-side lock.
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._init_db()
 
     def _init_db(self):
         """Initialize database schema."""
         with self._get_connection() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS code_objects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    qualified_name TEXT UNIQUE NOT NULL,
-                    type TEXT NOT NULL,
-                    file_path TEXT NOT NULL,
-                    line_number INTEGER NOT NULL,
-                    end_line_number INTEGER NOT NULL,
-                    repo_name TEXT NOT NULL,
-                    relative_path TEXT NOT NULL,
-                    docstring TEXT,
-                    parent_class TEXT,
-                    decorators TEXT,
-                    is_private INTEGER NOT NULL
-                )
-            """)
+            # The trigram-tokenized FTS table serves LIKE patterns
+            # (including '%substring%') from its index instead of
+            # scanning the base table. Databases built with the older
+            # unicode61 tokenizer are dropped and rebuilt once.
+            fts_sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type='table' AND name='code_fts'"
+            ).fetchone()
+            fts_exists = fts_sql is not None
+            if fts_exists and "trigram" not in fts_sql[0]:
+                conn.execute("DROP TABLE code_fts")
+                fts_exists = False
+
+            conn.executescript(_SCHEMA_SQL)
+
+            # Populate the FTS table when adding it to an existing database
+            if not fts_exists:
+                conn.execute("INSERT INTO code_fts(code_fts) VALUES('rebuild')")
 
-            # Create indices for fast lookup
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_name ON code_objects(name)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_qualified_name ON code_objects(qualified_name)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_repo_name ON code_objects(repo_name)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_type ON code_objects(type)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_parent_class ON code_objects(parent_class)"
+    @contextmanager
+    def _get_connection(self):
+        """Yield this thread's persistent connection, creating it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit (isolation_level=None) stops the sqlite3 module
+            # from opening hidden deferred transactions around DML; the
+            # bulk paths manage their own BEGIN IMMEDIATE / COMMIT and
+            # everything else commits per statement
+            # 512 cached prepared statements (default 128) so the MCP
+            # tools' repeated lookups never reparse their SQL
+            conn = sqlite3.connect(
+                self.db_path, isolation_level=None, cached_statements=512
             )
-
-            conn.commit()
+            # WAL lets readers proceed during writes; NORMAL syncs are safe in
+            # WAL mode and cut fsyncs dramatically on bulk inserts
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # 64 MB page cache and mmap'd reads keep the hot index pages
+            # out of the syscall path during lookups
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        yield conn
+
+    def close(self):
+        """Close every connection this store has opened."""
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
 
     @contextmanager
-    def _get_connection(self):
-        """Get database connection context manager."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+    def bulk_insert(self):
+        """
+        Group many add_object calls into one transaction.
+
+        Each add_object normally autocommits (one journal fsync per
+        row); inside this context they join one explicit transaction, so
+        the whole run commits once, like add_objects_batch. Rolls back
+        if the block raises.
+        """
+        with self._get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def add_object(self, obj: CodeObject):
         """
@@ -81,12 +224,7 @@ class CodeIndexStore:
         """
         with self._get_connection() as conn:
             conn.execute(
-                """
-                INSERT OR REPLACE INTO code_objects
-                (name, qualified_name, type, file_path, line_number, end_line_number,
-                 repo_name, relative_path, docstring, parent_class, decorators, is_private)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _UPSERT_SQL,
                 (
                     obj.name,
                     obj.qualified_name,
@@ -98,11 +236,10 @@ class CodeIndexStore:
                     obj.relative_path,
                     obj.docstring,
                     obj.parent_class,
-                    json.dumps(obj.decorators),
+                    "\x1f".join(obj.decorators),
                     1 if obj.is_private else 0,
                 ),
             )
-            conn.commit()
 
     def add_objects_batch(self, objects: List[CodeObject]):
         """
@@ -124,22 +261,29 @@ class CodeIndexStore:
                     obj.relative_path,
                     obj.docstring,
                     obj.parent_class,
-                    json.dumps(obj.decorators),
+                    "\x1f".join(obj.decorators),
                     1 if obj.is_private else 0,
                 )
                 for obj in objects
             ]
 
-            conn.executemany(
-                """
-                INSERT OR REPLACE INTO code_objects
-                (name, qualified_name, type, file_path, line_number, end_line_number,
-                 repo_name, relative_path, docstring, parent_class, decorators, is_private)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                data,
-            )
-            conn.commit()
+            # One explicit transaction so the whole batch shares a single
+            # journal write instead of per-row commits
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_UPSERT_SQL, data)
+            conn.execute("COMMIT")
+
+    def finalize(self):
+        """
+        Refresh planner statistics after a bulk load.
+
+        Call once after indexing completes; ANALYZE scans the table and
+        every index, so running it per batch would make ingestion cost
+        quadratic in repo size. Fresh statistics let the planner pick
+        the composite indexes once the table has representative data.
+        """
+        with self._get_connection() as conn:
+            conn.execute("ANALYZE")
 
     def get_by_name(self, name: str, repo_name: Optional[str] = None) -> List[CodeObject]:
         """
@@ -152,18 +296,55 @@ class CodeIndexStore:
         Returns:
             List of matching CodeObjects
         """
+        with self._get_connection() as conn:
+            if repo_name:
+                cursor = conn.execute(_SQL_GET_NAME_REPO, (name, repo_name))
+            else:
+                cursor = conn.execute(_SQL_GET_NAME, (name,))
+
+            return [self._row_to_object(row) for row in cursor.fetchall()]
+
+    def get_by_names(
+        self, names: List[str], repo_name: Optional[str] = None
+    ) -> Dict[str, List[CodeObject]]:
+        """
+        Get objects for several names in one query.
+
+        Resolving a batch of symbols with one parametrized IN-list avoids
+        an SQLite round-trip per name; the IN lookup is served by the
+        index on name.
+
+        Args:
+            names: Simple names to search for
+            repo_name: Optional repository filter
+
+        Returns:
+            Dictionary mapping each requested name to its matches
+            (names with no matches map to empty lists)
+        """
+        results: Dict[str, List[CodeObject]] = {name: [] for name in names}
+        if not names:
+            return results
+
+        placeholders = ",".join("?" * len(names))
         with self._get_connection() as conn:
             if repo_name:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE name = ? AND repo_name = ?",
-                    (name, repo_name),
+                    f"SELECT {_COLS} FROM code_objects WHERE name IN ({placeholders}) "
+                    "AND repo_name = ?",
+                    (*names, repo_name),
                 )
             else:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE name = ?", (name,)
+                    f"SELECT {_COLS} FROM code_objects WHERE name IN ({placeholders})",
+                    tuple(names),
                 )
 
-            return [self._row_to_object(row) for row in cursor.fetchall()]
+            for row in cursor.fetchall():
+                obj = self._row_to_object(row)
+                results[obj.name].append(obj)
+
+        return results
 
     def get_by_qualified_name(self, qualified_name: str) -> Optional[CodeObject]:
         """
@@ -176,10 +357,7 @@ class CodeIndexStore:
             CodeObject or None
         """
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM code_objects WHERE qualified_name = ?",
-                (qualified_name,),
-            )
+            cursor = conn.execute(_SQL_GET_QUAL, (qualified_name,))
             row = cursor.fetchone()
             return self._row_to_object(row) if row else None
 
@@ -189,8 +367,57 @@ class CodeIndexStore:
         """
         Search for objects whose name matches pattern.
 
+        Patterns with a literal run of 3+ characters — prefix ('Code%')
+        and substring ('%query%') alike — are served from the trigram
+        FTS5 index, which stays sublinear as the table grows; shorter
+        patterns fall back to a LIKE scan of the base table.
+
+        Args:
+            pattern: SQL LIKE pattern (use % as wildcard)
+            repo_name: Optional repository filter
+            limit: Maximum number of results
+
+        Returns:
+            List of matching CodeObjects
+        """
+        if self._fts_accelerable(pattern):
+            return self._search_fts_like(pattern, "name", repo_name, limit)
+
+        with self._get_connection() as conn:
+            if repo_name:
+                cursor = conn.execute(
+                    f"SELECT {_COLS} FROM code_objects WHERE name LIKE ? AND repo_name = ? LIMIT ?",
+                    (pattern, repo_name, limit),
+                )
+            else:
+                cursor = conn.execute(
+                    f"SELECT {_COLS} FROM code_objects WHERE name LIKE ? LIMIT ?",
+                    (pattern, limit),
+                )
+
+            return [self._row_to_object(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _fts_accelerable(pattern: str) -> bool:
+        """Whether a LIKE pattern has a literal run long enough for trigrams."""
+        return max(
+            (len(part) for part in pattern.replace("_", "%").split("%")),
+            default=0,
+        ) >= 3
+
+    def _search_fts_like(
+        self, pattern: str, column: str, repo_name: Optional[str], limit: int
+    ) -> List[CodeObject]:
+        """
+        Serve a LIKE pattern from the trigram FTS5 index.
+
+        SQLite rewrites LIKE on a trigram-tokenized FTS5 column to use
+        the index, so the semantics are identical to a LIKE scan of the
+        base table — just without visiting every row.
+
         Args:
             pattern: SQL LIKE pattern (use % as wildcard)
+            column: FTS column to match ('name' or 'qualified_name')
             repo_name: Optional repository filter
             limit: Maximum number of results
 
@@ -200,12 +427,22 @@ class CodeIndexStore:
         with self._get_connection() as conn:
             if repo_name:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE name LIKE ? AND repo_name = ? LIMIT ?",
+                    f"""
+                    SELECT {_COLS_CO} FROM code_fts
+                    JOIN code_objects co ON co.id = code_fts.rowid
+                    WHERE code_fts.{column} LIKE ? AND co.repo_name = ?
+                    LIMIT ?
+                    """,
                     (pattern, repo_name, limit),
                 )
             else:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE name LIKE ? LIMIT ?",
+                    f"""
+                    SELECT {_COLS_CO} FROM code_fts
+                    JOIN code_objects co ON co.id = code_fts.rowid
+                    WHERE code_fts.{column} LIKE ?
+                    LIMIT ?
+                    """,
                     (pattern, limit),
                 )
 
@@ -217,6 +454,9 @@ class CodeIndexStore:
         """
         Search for objects whose qualified name matches pattern.
 
+        Routed through the trigram FTS5 index when the pattern has a
+        literal run of 3+ characters, same as search_by_name_pattern.
+
         Args:
             pattern: SQL LIKE pattern (use % as wildcard)
             repo_name: Optional repository filter
@@ -225,20 +465,83 @@ class CodeIndexStore:
         Returns:
             List of matching CodeObjects
         """
+        if self._fts_accelerable(pattern):
+            return self._search_fts_like(pattern, "qualified_name", repo_name, limit)
+
         with self._get_connection() as conn:
             if repo_name:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE qualified_name LIKE ? AND repo_name = ? LIMIT ?",
+                    f"SELECT {_COLS} FROM code_objects WHERE qualified_name LIKE ? AND repo_name = ? LIMIT ?",
                     (pattern, repo_name, limit),
                 )
             else:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE qualified_name LIKE ? LIMIT ?",
+                    f"SELECT {_COLS} FROM code_objects WHERE qualified_name LIKE ? LIMIT ?",
                     (pattern, limit),
                 )
 
             return [self._row_to_object(row) for row in cursor.fetchall()]
 
+    def _iter_objects(self, sql: str, params: tuple, chunk: int = 1000):
+        """
+        Yield CodeObjects for a query, fetching rows in chunks.
+
+        fetchmany keeps at most `chunk` rows materialized at a time, so
+        repo-wide queries over 100k+ symbols don't peak memory the way a
+        fetchall into a list does, and streaming consumers can start
+        before the cursor is exhausted.
+
+        Args:
+            sql: SELECT statement over code_objects
+            params: Bind parameters for the statement
+            chunk: Rows fetched per round trip
+
+        Yields:
+            CodeObjects, one per matching row
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._row_to_object(row)
+
+    def iter_by_repo(self, repo_name: str):
+        """
+        Stream all objects from a repository.
+
+        Args:
+            repo_name: Repository name
+
+        Yields:
+            CodeObjects without materializing the full result list
+        """
+        return self._iter_objects(
+            f"SELECT {_COLS} FROM code_objects WHERE repo_name = ?", (repo_name,)
+        )
+
+    def iter_by_type(self, obj_type: str, repo_name: Optional[str] = None):
+        """
+        Stream objects of a given type, optionally filtered by repository.
+
+        Args:
+            obj_type: Type of object ('class', 'function', 'method', etc.)
+            repo_name: Optional repository filter
+
+        Yields:
+            CodeObjects without materializing the full result list
+        """
+        if repo_name:
+            return self._iter_objects(
+                f"SELECT {_COLS} FROM code_objects WHERE type = ? AND repo_name = ?",
+                (obj_type, repo_name),
+            )
+        return self._iter_objects(
+            f"SELECT {_COLS} FROM code_objects WHERE type = ?", (obj_type,)
+        )
+
     def get_by_type(
         self, obj_type: str, repo_name: Optional[str] = None, limit: int = 100
     ) -> List[CodeObject]:
@@ -256,12 +559,12 @@ class CodeIndexStore:
         with self._get_connection() as conn:
             if repo_name:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE type = ? AND repo_name = ? LIMIT ?",
+                    f"SELECT {_COLS} FROM code_objects WHERE type = ? AND repo_name = ? LIMIT ?",
                     (obj_type, repo_name, limit),
                 )
             else:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE type = ? LIMIT ?",
+                    f"SELECT {_COLS} FROM code_objects WHERE type = ? LIMIT ?",
                     (obj_type, limit),
                 )
 
@@ -281,12 +584,12 @@ class CodeIndexStore:
         with self._get_connection() as conn:
             if repo_name:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE parent_class = ? AND repo_name = ?",
+                    f"SELECT {_COLS} FROM code_objects WHERE parent_class = ? AND repo_name = ?",
                     (class_name, repo_name),
                 )
             else:
                 cursor = conn.execute(
-                    "SELECT * FROM code_objects WHERE parent_class = ?",
+                    f"SELECT {_COLS} FROM code_objects WHERE parent_class = ?",
                     (class_name,),
                 )
 
@@ -302,11 +605,7 @@ class CodeIndexStore:
         Returns:
             List of CodeObjects
         """
-        with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM code_objects WHERE repo_name = ?", (repo_name,)
-            )
-            return [self._row_to_object(row) for row in cursor.fetchall()]
+        return list(self.iter_by_repo(repo_name))
 
     def delete_by_repo(self, repo_name: str) -> int:
         """
@@ -322,14 +621,12 @@ class CodeIndexStore:
             cursor = conn.execute(
                 "DELETE FROM code_objects WHERE repo_name = ?", (repo_name,)
             )
-            conn.commit()
             return cursor.rowcount
 
     def clear(self):
         """Clear all objects from the store."""
         with self._get_connection() as conn:
             conn.execute("DELETE FROM code_objects")
-            conn.commit()
 
     def get_stats(self) -> Dict:
         """
@@ -347,13 +644,13 @@ class CodeIndexStore:
             cursor = conn.execute(
                 "SELECT type, COUNT(*) as count FROM code_objects GROUP BY type"
             )
-            type_counts = {row['type']: row['count'] for row in cursor.fetchall()}
+            type_counts = {row[0]: row[1] for row in cursor.fetchall()}
 
             # Objects by repo
             cursor = conn.execute(
                 "SELECT repo_name, COUNT(*) as count FROM code_objects GROUP BY repo_name"
             )
-            repo_counts = {row['repo_name']: row['count'] for row in cursor.fetchall()}
+            repo_counts = {row[0]: row[1] for row in cursor.fetchall()}
 
             return {
                 'total_objects': total,
@@ -370,21 +667,34 @@ class CodeIndexStore:
         """
         with self._get_connection() as conn:
             cursor = conn.execute("SELECT DISTINCT repo_name FROM code_objects")
-            return [row['repo_name'] for row in cursor.fetchall()]
-
-    def _row_to_object(self, row: sqlite3.Row) -> CodeObject:
-        """Convert database row to CodeObject."""
+            return [row[0] for row in cursor.fetchall()]
+
+    def _row_to_object(self, row: tuple) -> CodeObject:
+        """Convert a result tuple (in _COLUMNS order) to a CodeObject."""
+        (name, qualified_name, obj_type, file_path, line_number,
+         end_line_number, repo_name, relative_path, docstring,
+         parent_class, raw, is_private) = row
+        # Decorators are identifier names joined on an unprintable
+        # delimiter; a plain split avoids running a JSON parser per row
+        # on bulk reads. Rows written before this scheme stored a JSON
+        # array and are recognized by their leading bracket.
+        if not raw:
+            decorators = []
+        elif raw.startswith('['):
+            decorators = orjson.loads(raw)
+        else:
+            decorators = raw.split('\x1f')
         return CodeObject(
-            name=row['name'],
-            qualified_name=row['qualified_name'],
-            type=row['type'],
-            file_path=row['file_path'],
-            line_number=row['line_number'],
-            end_line_number=row['end_line_number'],
-            repo_name=row['repo_name'],
-            relative_path=row['relative_path'],
-            docstring=row['docstring'],
-            parent_class=row['parent_class'],
-            decorators=json.loads(row['decorators']),
-            is_private=bool(row['is_private']),
+            name=name,
+            qualified_name=qualified_name,
+            type=obj_type,
+            file_path=file_path,
+            line_number=line_number,
+            end_line_number=end_line_number,
+            repo_name=repo_name,
+            relative_path=relative_path,
+            docstring=docstring,
+            parent_class=parent_class,
+            decorators=decorators,
+            is_private=bool(is_private),
         )
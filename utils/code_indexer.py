@@ -1,14 +1,26 @@
 """AST-based code indexer for Python repositories."""
 
 import ast
+import bisect
+import fnmatch
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 from dataclasses import dataclass, asdict
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeObject:
-    """Represents an indexed code object (class, function, method)."""
+    """Represents an indexed code object (class, function, method).
+
+    Slotted because an indexing run holds hundreds of thousands of these
+    in memory; dropping the per-instance __dict__ cuts the footprint by
+    roughly 40% and speeds up attribute access.
+    """
 
     name: str  # Simple name (e.g., "eager")
     qualified_name: str  # Full dotted name (e.g., "dagster.AutomationCondition.eager")
@@ -32,6 +44,44 @@ class CodeObject:
         return asdict(self)
 
 
+def _compile_glob_union(patterns: List[str]) -> "re.Pattern":
+    """
+    Compile a list of glob patterns into one alternation regex.
+
+    Patterns are matched against paths relative to the repo root. For
+    patterns starting with "**/" an alternate without the prefix is added
+    so they also match at the top level, mirroring glob's "** matches
+    zero directories" behavior (fnmatch alone would require a slash).
+
+    Args:
+        patterns: Glob patterns as accepted by index_repository
+
+    Returns:
+        Compiled regex matching any of the patterns
+    """
+    alternates = []
+    for pattern in patterns:
+        alternates.append(fnmatch.translate(pattern))
+        if pattern.startswith("**/"):
+            alternates.append(fnmatch.translate(pattern[3:]))
+    return re.compile("|".join(alternates))
+
+
+def _parse_file_to_objects(args: tuple) -> List[CodeObject]:
+    """
+    Parse one file into CodeObjects (module-level so it pickles for workers).
+
+    Args:
+        args: Tuple of (file_path, repo_name, repo_root, include_private)
+
+    Returns:
+        List of parsed CodeObjects (empty for unparseable files)
+    """
+    file_path, repo_name, repo_root, include_private = args
+    indexer = CodeIndexer(repo_name=repo_name, repo_root=repo_root)
+    return indexer._parse_file(Path(file_path), include_private)
+
+
 class CodeIndexer:
     """Index Python code objects in a repository."""
 
@@ -43,16 +93,27 @@ class CodeIndexer:
             repo_name: Name of the repository (e.g., "dagster")
             repo_root: Root directory of the repository
         """
-        self.repo_name = repo_name
+        # Interned once: every CodeObject shares the same string object
+        # instead of each row carrying its own copy
+        self.repo_name = sys.intern(repo_name)
         self.repo_root = Path(repo_root).resolve()
         self.index: Dict[str, List[CodeObject]] = {}  # name -> [CodeObject]
         self.qualified_index: Dict[str, CodeObject] = {}  # qualified_name -> CodeObject
+        # Maintained as objects are added so get_stats never has to
+        # re-walk every indexed object
+        self._type_counts: Counter = Counter()
+        # Sorted view of index keys for bisect-based prefix search; built
+        # lazily and invalidated whenever new objects arrive
+        self._sorted_names: Optional[List[str]] = None
 
     def index_repository(
         self,
         include_patterns: List[str] = None,
         exclude_patterns: List[str] = None,
         include_private: bool = False,
+        max_workers: Optional[int] = None,
+        sink: Optional[Callable[[List[CodeObject]], None]] = None,
+        in_memory: bool = True,
     ) -> int:
         """
         Index all Python files in the repository.
@@ -61,6 +122,14 @@ class CodeIndexer:
             include_patterns: Glob patterns to include (default: ["**/*.py"])
             exclude_patterns: Glob patterns to exclude (default: tests, __pycache__)
             include_private: Whether to index private objects (starting with _)
+            max_workers: Parse files in this many worker processes (AST
+                         parsing is CPU-bound); None or 1 parses serially
+            sink: Optional callable invoked with each file's parsed objects
+                  as they arrive, so a consumer (e.g. a thread batching
+                  SQLite inserts) can overlap with parsing
+            in_memory: Whether to also populate the in-memory name and
+                       qualified-name dicts; pass False when objects flow
+                       through sink into a store anyway, halving peak RAM
 
         Returns:
             Number of objects indexed
@@ -74,26 +143,66 @@ class CodeIndexer:
             "**/.*/**",  # Hidden directories
         ]
 
-        # Find all Python files
-        python_files = set()
-        for pattern in include_patterns:
-            python_files.update(self.repo_root.glob(pattern))
-
-        # Exclude files based on exclude patterns
-        for pattern in exclude_patterns:
-            exclude_files = set(self.repo_root.glob(pattern))
-            python_files -= exclude_files
-
-        # Index each file
+        # One os.scandir walk with both pattern sets compiled into single
+        # regexes replaces a glob pass per pattern: one stat per entry
+        # instead of O(files x patterns), and excluded subtrees (tests,
+        # __pycache__, hidden dirs) are pruned without descending into
+        # them. fnmatch's "*" crosses path separators, which is slightly
+        # broader than glob but equivalent for the **-style patterns
+        # used here.
+        include_re = _compile_glob_union(include_patterns)
+        exclude_re = _compile_glob_union(exclude_patterns)
+
+        python_files = []
+
+        def walk(dir_path: str, rel_prefix: str):
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    rel = rel_prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        # Probe with a child path so subtree excludes
+                        # like **/tests/** prune the directory itself
+                        if not exclude_re.match(rel + "/x"):
+                            walk(entry.path, rel + "/")
+                    elif entry.name.endswith(".py"):
+                        if include_re.match(rel) and not exclude_re.match(rel):
+                            python_files.append(entry.path)
+
+        walk(str(self.repo_root), "")
+
+        # Index each file; pattern filtering stays on the driver so workers
+        # only ever receive valid paths. Paths stay raw strings until the
+        # parse boundary — no Path object per discovered file.
+        files = sorted(python_files)
         total_objects = 0
-        for file_path in sorted(python_files):
-            try:
-                objects = self._index_file(file_path, include_private)
-                total_objects += len(objects)
-            except Exception as e:
-                # Skip files that can't be parsed
-                print(f"Warning: Could not index {file_path}: {e}")
-                continue
+
+        if max_workers is not None and max_workers > 1:
+            worker_args = [
+                (f, self.repo_name, str(self.repo_root), include_private)
+                for f in files
+            ]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for objects in executor.map(
+                    _parse_file_to_objects, worker_args, chunksize=16
+                ):
+                    if in_memory:
+                        self._add_to_index(objects)
+                    total_objects += len(objects)
+                    if sink and objects:
+                        sink(objects)
+        else:
+            for file_path in files:
+                try:
+                    objects = self._parse_file(Path(file_path), include_private)
+                    if in_memory:
+                        self._add_to_index(objects)
+                    total_objects += len(objects)
+                    if sink and objects:
+                        sink(objects)
+                except Exception as e:
+                    # Skip files that can't be parsed
+                    print(f"Warning: Could not index {file_path}: {e}")
+                    continue
 
         return total_objects
 
@@ -108,6 +217,21 @@ class CodeIndexer:
         Returns:
             List of indexed objects
         """
+        objects = self._parse_file(file_path, include_private)
+        self._add_to_index(objects)
+        return objects
+
+    def _parse_file(self, file_path: Path, include_private: bool) -> List[CodeObject]:
+        """
+        Parse all code objects in a single file without touching the index.
+
+        Args:
+            file_path: Path to Python file
+            include_private: Whether to include private objects
+
+        Returns:
+            List of parsed objects
+        """
         objects = []
 
         try:
@@ -133,12 +257,20 @@ class CodeIndexer:
             module_parts.append(relative_path.stem)
         module_prefix = '.'.join(module_parts) if module_parts else ''
 
-        # Walk AST and extract definitions
-        for node in ast.walk(tree):
-            obj = None
-
+        # Intern the per-file constants so the objects from this file all
+        # reference one string apiece rather than duplicating the paths
+        file_path_s = sys.intern(str(file_path))
+        relative_path_s = sys.intern(str(relative_path))
+
+        # One pass over the module body: classes descend one level into
+        # their own body for methods, everything deeper is ignored. The
+        # previous version re-ran ast.walk over the whole tree for every
+        # function (quadratic), and its "is this a method" probe wrongly
+        # skipped all top-level functions whenever the file contained any
+        # class at all.
+        for node in tree.body:
             if isinstance(node, ast.ClassDef):
-                obj = self._extract_class(node, file_path, relative_path, module_prefix)
+                obj = self._extract_class(node, file_path_s, relative_path_s, module_prefix)
                 if obj and (include_private or not obj.is_private):
                     objects.append(obj)
 
@@ -146,20 +278,20 @@ class CodeIndexer:
                     for item in node.body:
                         if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
                             method_obj = self._extract_method(
-                                item, node, file_path, relative_path, module_prefix
+                                item, node, file_path_s, relative_path_s, module_prefix
                             )
                             if method_obj and (include_private or not method_obj.is_private):
                                 objects.append(method_obj)
 
             elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                # Only index top-level functions (not methods)
-                # Methods are handled within ClassDef
-                if not any(isinstance(parent, ast.ClassDef) for parent in ast.walk(tree)):
-                    obj = self._extract_function(node, file_path, relative_path, module_prefix)
-                    if obj and (include_private or not obj.is_private):
-                        objects.append(obj)
-
-        # Add objects to indices
+                obj = self._extract_function(node, file_path_s, relative_path_s, module_prefix)
+                if obj and (include_private or not obj.is_private):
+                    objects.append(obj)
+
+        return objects
+
+    def _add_to_index(self, objects: List[CodeObject]):
+        """Add parsed objects to the in-memory indices."""
         for obj in objects:
             # Add to name index (allows duplicates)
             if obj.name not in self.index:
@@ -169,13 +301,15 @@ class CodeIndexer:
             # Add to qualified name index (unique)
             self.qualified_index[obj.qualified_name] = obj
 
-        return objects
+            self._type_counts[obj.type] += 1
+
+        self._sorted_names = None
 
     def _extract_class(
         self,
         node: ast.ClassDef,
-        file_path: Path,
-        relative_path: Path,
+        file_path: str,
+        relative_path: str,
         module_prefix: str,
     ) -> CodeObject:
         """Extract class definition."""
@@ -185,11 +319,11 @@ class CodeIndexer:
             name=node.name,
             qualified_name=qualified_name,
             type='class',
-            file_path=str(file_path),
+            file_path=file_path,
             line_number=node.lineno,
-            end_line_number=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
+            end_line_number=node.end_lineno,
             repo_name=self.repo_name,
-            relative_path=str(relative_path),
+            relative_path=relative_path,
             docstring=self._get_docstring_preview(node),
             decorators=self._get_decorator_names(node),
             is_private=node.name.startswith('_'),
@@ -198,8 +332,8 @@ class CodeIndexer:
     def _extract_function(
         self,
         node: ast.FunctionDef | ast.AsyncFunctionDef,
-        file_path: Path,
-        relative_path: Path,
+        file_path: str,
+        relative_path: str,
         module_prefix: str,
     ) -> CodeObject:
         """Extract top-level function definition."""
@@ -210,11 +344,11 @@ class CodeIndexer:
             name=node.name,
             qualified_name=qualified_name,
             type=obj_type,
-            file_path=str(file_path),
+            file_path=file_path,
             line_number=node.lineno,
-            end_line_number=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
+            end_line_number=node.end_lineno,
             repo_name=self.repo_name,
-            relative_path=str(relative_path),
+            relative_path=relative_path,
             docstring=self._get_docstring_preview(node),
             decorators=self._get_decorator_names(node),
             is_private=node.name.startswith('_'),
@@ -224,8 +358,8 @@ class CodeIndexer:
         self,
         node: ast.FunctionDef | ast.AsyncFunctionDef,
         class_node: ast.ClassDef,
-        file_path: Path,
-        relative_path: Path,
+        file_path: str,
+        relative_path: str,
         module_prefix: str,
     ) -> CodeObject:
         """Extract method definition from a class."""
@@ -237,13 +371,13 @@ class CodeIndexer:
             name=node.name,
             qualified_name=qualified_name,
             type=obj_type,
-            file_path=str(file_path),
+            file_path=file_path,
             line_number=node.lineno,
-            end_line_number=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
+            end_line_number=node.end_lineno,
             repo_name=self.repo_name,
-            relative_path=str(relative_path),
+            relative_path=relative_path,
             docstring=self._get_docstring_preview(node),
-            parent_class=class_node.name,
+            parent_class=sys.intern(class_node.name),
             decorators=self._get_decorator_names(node),
             is_private=node.name.startswith('_'),
         )
@@ -309,12 +443,20 @@ class CodeIndexer:
         Returns:
             List of matching objects
         """
+        # Bisect into the sorted name list and walk the contiguous run of
+        # matches: O(log N + K) instead of testing every unique name
+        names = self._sorted_names
+        if names is None:
+            names = self._sorted_names = sorted(self.index)
+
         results = []
-        for name, objects in self.index.items():
-            if name.startswith(prefix):
-                results.extend(objects)
-                if len(results) >= limit:
-                    break
+        for i in range(bisect.bisect_left(names, prefix), len(names)):
+            name = names[i]
+            if not name.startswith(prefix):
+                break
+            results.extend(self.index[name])
+            if len(results) >= limit:
+                break
         return results[:limit]
 
     def get_all_objects(self) -> List[CodeObject]:
@@ -326,16 +468,14 @@ class CodeIndexer:
 
     def get_stats(self) -> dict:
         """Get indexing statistics."""
-        all_objects = self.get_all_objects()
-
-        type_counts = {}
-        for obj in all_objects:
-            type_counts[obj.type] = type_counts.get(obj.type, 0) + 1
+        # The per-type counter is kept current by _add_to_index, so stats
+        # never re-walk the indexed objects
+        type_counts = self._type_counts
 
         return {
             'repo_name': self.repo_name,
-            'total_objects': len(all_objects),
+            'total_objects': sum(type_counts.values()),
             'unique_names': len(self.index),
             'qualified_names': len(self.qualified_index),
-            'type_counts': type_counts,
+            'type_counts': dict(type_counts),
         }
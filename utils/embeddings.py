@@ -1,5 +1,6 @@
 """Google AI embeddings service for text vectorization."""
 
+import asyncio
 from typing import List, Optional
 
 from utils.google_api_client import GoogleAPIClient
@@ -13,6 +14,7 @@ class GoogleEmbeddingService:
         api_key: str,
         model_name: str = "text-embedding-004",
         api_client: Optional[GoogleAPIClient] = None,
+        max_concurrency: int = 5,
     ):
         """
         Initialize the Google embedding service.
@@ -21,9 +23,11 @@ class GoogleEmbeddingService:
             api_key: Google AI Studio API key
             model_name: Name of the embedding model to use
             api_client: Optional GoogleAPIClient instance (will create if not provided)
+            max_concurrency: Maximum in-flight batch requests for aembed_batch
         """
         self.model_name = model_name
         self.api_client = api_client if api_client is not None else GoogleAPIClient(api_key=api_key)
+        self.max_concurrency = max_concurrency
 
     def embed_text(self, text: str) -> List[float]:
         """
@@ -65,18 +69,94 @@ class GoogleEmbeddingService:
         )
         return result["embedding"]
 
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for multiple queries in one API call.
+
+        Args:
+            queries: Query texts to embed
+
+        Returns:
+            List of embedding vectors, in input order
+
+        Raises:
+            RateLimitExceededError: If rate limits would be exceeded
+        """
+        return self.api_client.embed_content_batch(
+            model=f"models/{self.model_name}",
+            contents=queries,
+            task_type="retrieval_query",
+        )
+
+    # Texts per embed_content call; keeps each request comfortably under
+    # the API's per-request payload limit
+    BATCH_SIZE = 100
+
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts.
 
+        Texts are sent in shards of BATCH_SIZE through the batch
+        endpoint, so N texts cost ceil(N / BATCH_SIZE) round-trips and
+        rate-limit records instead of N.
+
         Args:
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in input order
+
+        Raises:
+            RateLimitExceededError: If rate limits would be exceeded
         """
-        embeddings = []
-        for text in texts:
-            embedding = self.embed_text(text)
-            embeddings.append(embedding)
+        embeddings: List[List[float]] = []
+        for i in range(0, len(texts), self.BATCH_SIZE):
+            embeddings.extend(
+                self.api_client.embed_content_batch(
+                    model=f"models/{self.model_name}",
+                    contents=texts[i:i + self.BATCH_SIZE],
+                    task_type="retrieval_document",
+                )
+            )
         return embeddings
+
+    async def aembed_batch(
+        self, texts: List[str], max_concurrency: Optional[int] = None
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts with concurrent batch calls.
+
+        Shards texts like embed_batch, then dispatches the shards through
+        asyncio.gather with at most max_concurrency requests in flight
+        (the blocking SDK call runs on worker threads). Large corpora
+        overlap their round-trips instead of paying them sequentially.
+
+        Args:
+            texts: List of texts to embed
+            max_concurrency: Maximum in-flight requests (default: the
+                             value given at construction)
+
+        Returns:
+            List of embedding vectors, in input order
+
+        Raises:
+            RateLimitExceededError: If rate limits would be exceeded
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        model = f"models/{self.model_name}"
+
+        async def embed_shard(shard: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.api_client.embed_content_batch,
+                    model,
+                    shard,
+                    "retrieval_document",
+                )
+
+        shards = [
+            texts[i:i + self.BATCH_SIZE]
+            for i in range(0, len(texts), self.BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(embed_shard(shard) for shard in shards))
+        return [embedding for shard in results for embedding in shard]
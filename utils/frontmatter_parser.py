@@ -3,6 +3,20 @@
 import re
 from typing import Optional
 
+# libyaml's C parser is 5-20x faster than pure Python and handles lists
+# and nested mappings the simple line parser below cannot; fall back to
+# the pure-Python loader, then to the line parser if PyYAML is absent
+try:
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+except ImportError:
+    yaml = None
+    _YamlLoader = None
+
 
 class FrontmatterParser:
     """Parse YAML frontmatter from markdown documents."""
@@ -40,10 +54,34 @@ class FrontmatterParser:
 
     @staticmethod
     def _parse_yaml(yaml_text: str) -> dict:
+        """
+        Parse YAML frontmatter into a dictionary.
+
+        Uses PyYAML (C-accelerated when libyaml is available); falls back
+        to the simple line parser if PyYAML is not installed or the block
+        is malformed.
+
+        Args:
+            yaml_text: YAML frontmatter text
+
+        Returns:
+            Dictionary of metadata
+        """
+        if yaml is not None:
+            try:
+                parsed = yaml.load(yaml_text, Loader=_YamlLoader)
+            except yaml.YAMLError:
+                return FrontmatterParser._parse_yaml_simple(yaml_text)
+            return parsed if isinstance(parsed, dict) else {}
+        return FrontmatterParser._parse_yaml_simple(yaml_text)
+
+    @staticmethod
+    def _parse_yaml_simple(yaml_text: str) -> dict:
         """
         Simple YAML parser for frontmatter.
 
-        Handles basic key-value pairs. For complex YAML, consider using PyYAML library.
+        Handles basic key-value pairs only; kept as the fallback when
+        PyYAML is unavailable or rejects the block.
 
         Args:
             yaml_text: YAML frontmatter text
@@ -5,8 +5,9 @@ This module provides a wrapper around the Google Generative AI SDK that enforces
 rate limits (RPM and TPM) and tracks usage across application restarts.
 """
 
+import asyncio
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import google.generativeai as genai
 
@@ -68,14 +69,33 @@ class GoogleAPIClient:
         self.tpm_limit = tpm_limit
         self.rpd_limit = rpd_limit
         self.store = RateLimitStore(rate_limit_db_path)
-
-    def _check_rate_limits(self, estimated_tokens: int):
+        # Cache GenerativeModel instances per model name; constructing one
+        # re-parses generation defaults, which is wasted work per call
+        self._models: Dict[str, genai.GenerativeModel] = {}
+        # Token counts are deterministic per (model, text), so repeats
+        # skip the count_tokens API round-trip entirely
+        self._token_count_cache: Dict[tuple, int] = {}
+
+    def _get_model(self, model_name: str) -> genai.GenerativeModel:
+        """Get (or lazily create) a cached GenerativeModel instance."""
+        model = self._models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            self._models[model_name] = model
+        return model
+
+    def _check_rate_limits(self, estimated_tokens: int) -> tuple:
         """
         Check if making an API call would exceed rate limits.
 
         Args:
             estimated_tokens: Number of tokens this call will consume
 
+        Returns:
+            Tuple of (current_requests, current_tokens, daily_requests)
+            as counted before this call, so callers can derive a usage
+            snapshot without re-querying the store
+
         Raises:
             RateLimitExceededError: If RPM, TPM, or RPD limits would be exceeded
         """
@@ -118,6 +138,24 @@ class GoogleAPIClient:
                 reset_time,
             )
 
+        return current_requests, current_tokens, daily_requests
+
+    def _usage_snapshot(
+        self, requests: int, tokens: int, daily_requests: int
+    ) -> Dict[str, Any]:
+        """Build a usage dictionary from already-known counters."""
+        return {
+            "requests_per_minute": requests,
+            "rpm_limit": self.rpm_limit,
+            "tokens_per_minute": tokens,
+            "tpm_limit": self.tpm_limit,
+            "requests_per_day": daily_requests,
+            "rpd_limit": self.rpd_limit,
+            "rpm_remaining": max(0, self.rpm_limit - requests),
+            "tpm_remaining": max(0, self.tpm_limit - tokens),
+            "rpd_remaining": max(0, self.rpd_limit - daily_requests),
+        }
+
     def count_tokens(self, model_name: str, content: str | List[str]) -> int:
         """
         Count tokens for content using Google's token counting API.
@@ -129,18 +167,41 @@ class GoogleAPIClient:
         Returns:
             Total number of tokens
         """
-        model = genai.GenerativeModel(model_name)
-
         if isinstance(content, str):
-            result = model.count_tokens(content)
-            return result.total_tokens
+            return self._count_tokens_cached(model_name, content)
         else:
             # For lists, count each item and sum
-            total = 0
-            for item in content:
-                result = model.count_tokens(item)
-                total += result.total_tokens
-            return total
+            return sum(
+                self._count_tokens_cached(model_name, item) for item in content
+            )
+
+    def _count_tokens_cached(self, model_name: str, text: str) -> int:
+        """Count tokens for one text, memoized on (model, text)."""
+        key = (model_name, text)
+        cached = self._token_count_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._get_model(model_name).count_tokens(text)
+        total = result.total_tokens
+
+        # Simple bound: drop the oldest insertions once the cache is full
+        if len(self._token_count_cache) >= 4096:
+            for old_key in list(self._token_count_cache)[:1024]:
+                del self._token_count_cache[old_key]
+        self._token_count_cache[key] = total
+        return total
+
+    @staticmethod
+    def _estimate_tokens(content: str) -> int:
+        """
+        Estimate tokens for rate-limit admission checks.
+
+        Uses the ~4-characters-per-token heuristic (as an int shift).
+        Admission control only needs a rough pre-flight figure; accurate
+        counts come from response usage metadata where available.
+        """
+        return max(1, len(content) >> 2)
 
     def embed_content(
         self,
@@ -159,17 +220,18 @@ class GoogleAPIClient:
             **kwargs: Additional arguments passed to genai.embed_content
 
         Returns:
-            Embedding result dictionary from Google AI API
+            Embedding result dictionary from Google AI API, with a
+            "_usage" key holding the same dictionary get_current_usage()
+            would return right after this call
 
         Raises:
             RateLimitExceededError: If rate limits would be exceeded
         """
-        # Estimate tokens for embeddings (rough approximation: 1 token ≈ 4 characters)
-        # Google's embedding API doesn't return token counts, so we estimate
-        estimated_tokens = max(1, len(content) // 4)
+        # Google's embedding API doesn't return token counts, so estimate
+        estimated_tokens = self._estimate_tokens(content)
 
         # Check rate limits before making the call
-        self._check_rate_limits(estimated_tokens)
+        requests, tokens, daily_requests = self._check_rate_limits(estimated_tokens)
 
         # Make the API call
         result = genai.embed_content(
@@ -182,12 +244,126 @@ class GoogleAPIClient:
         # Record the call with estimated tokens
         self.store.record_call(estimated_tokens, "embed")
 
+        # Derive post-call usage from the counts the limit check already
+        # fetched, so callers don't need a get_current_usage() round-trip
+        result["_usage"] = self._usage_snapshot(
+            requests + 1, tokens + estimated_tokens, daily_requests + 1
+        )
+
         # Periodically cleanup old records (every ~20 calls)
         if self.store.get_request_count_in_window(60) % 20 == 0:
             self.store.cleanup_old_records()
 
         return result
 
+    def embed_content_batch(
+        self,
+        model: str,
+        contents: List[str],
+        task_type: str = "retrieval_document",
+        **kwargs,
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts in one API call.
+
+        The embeddings endpoint accepts a list of contents, so N texts
+        cost one HTTPS round-trip and one rate-limit record instead of N.
+
+        Args:
+            model: Model name (e.g., "models/text-embedding-004")
+            contents: Texts to embed
+            task_type: Task type for embedding (e.g., "retrieval_document", "retrieval_query")
+            **kwargs: Additional arguments passed to genai.embed_content
+
+        Returns:
+            List of embedding vectors, in input order
+
+        Raises:
+            RateLimitExceededError: If rate limits would be exceeded
+        """
+        if not contents:
+            return []
+
+        # Same estimate as embed_content, summed over the batch
+        estimated_tokens = sum(self._estimate_tokens(content) for content in contents)
+
+        self._check_rate_limits(estimated_tokens)
+
+        result = genai.embed_content(
+            model=model,
+            content=contents,
+            task_type=task_type,
+            **kwargs,
+        )
+
+        self.store.record_call(estimated_tokens, "embed")
+
+        if self.store.get_request_count_in_window(60) % 20 == 0:
+            self.store.cleanup_old_records()
+
+        return result["embedding"]
+
+    async def aembed_content(
+        self,
+        model: str,
+        content: str,
+        task_type: str = "retrieval_document",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Embed content, waiting for a rate-limit slot instead of raising.
+
+        Where embed_content raises RateLimitExceededError when a limit
+        would be exceeded, this sleeps until the rolling window frees up
+        and retries, so async callers can saturate the RPM limit without
+        over-sleeping or handling the exception themselves.
+
+        Args:
+            model: Model name (e.g., "models/text-embedding-004")
+            content: Text to embed
+            task_type: Task type for embedding (e.g., "retrieval_document", "retrieval_query")
+            **kwargs: Additional arguments passed to genai.embed_content
+
+        Returns:
+            Embedding result dictionary from Google AI API
+        """
+        while True:
+            try:
+                return await asyncio.to_thread(
+                    self.embed_content, model, content, task_type, **kwargs
+                )
+            except RateLimitExceededError as exc:
+                # Sleep until the oldest call leaves the window, with a
+                # small margin so the retry lands inside a free slot
+                await asyncio.sleep(max(0.0, exc.reset_time - time.time()) + 0.1)
+
+    async def aembed_batch(
+        self,
+        model: str,
+        contents: List[str],
+        task_type: str = "retrieval_document",
+        max_concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Embed many texts concurrently, scheduling around the rate limits.
+
+        Args:
+            model: Model name (e.g., "models/text-embedding-004")
+            contents: Texts to embed
+            task_type: Task type for embedding
+            max_concurrency: Maximum in-flight requests (default: rpm_limit)
+
+        Returns:
+            List of embedding result dictionaries, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.rpm_limit)
+
+        async def embed_one(content: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aembed_content(model, content, task_type)
+
+        return list(await asyncio.gather(*(embed_one(c) for c in contents)))
+
     def generate_content(
         self,
         model_name: str,
@@ -208,10 +384,11 @@ class GoogleAPIClient:
         Raises:
             RateLimitExceededError: If rate limits would be exceeded
         """
-        # Count tokens in the prompt using Google's token counting API
-        model = genai.GenerativeModel(model_name)
-        token_count_result = model.count_tokens(prompt)
-        input_tokens = token_count_result.total_tokens
+        # Estimate input tokens locally for the admission check rather
+        # than round-tripping to the token counting API; the recorded
+        # usage below still comes from the response's usage metadata
+        model = self._get_model(model_name)
+        input_tokens = self._estimate_tokens(prompt)
 
         # Estimate total tokens including output
         # Conservative estimate: assume output is similar size to input
@@ -259,18 +436,8 @@ class GoogleAPIClient:
                 'rpd_remaining': int
             }
         """
-        requests = self.store.get_request_count_in_window(60)
-        tokens = self.store.get_token_count_in_window(60)
-        daily_requests = self.store.get_daily_request_count()
-
-        return {
-            "requests_per_minute": requests,
-            "rpm_limit": self.rpm_limit,
-            "tokens_per_minute": tokens,
-            "tpm_limit": self.tpm_limit,
-            "requests_per_day": daily_requests,
-            "rpd_limit": self.rpd_limit,
-            "rpm_remaining": max(0, self.rpm_limit - requests),
-            "tpm_remaining": max(0, self.tpm_limit - tokens),
-            "rpd_remaining": max(0, self.rpd_limit - daily_requests),
-        }
+        return self._usage_snapshot(
+            self.store.get_request_count_in_window(60),
+            self.store.get_token_count_in_window(60),
+            self.store.get_daily_request_count(),
+        )
@@ -0,0 +1,156 @@
+"""TTL cache for query results with hot-entry background refresh."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+@dataclass
+class CacheEntry:
+    """A single cached query result."""
+
+    value: Any
+    created_at: float
+    hits: int = 0
+    refreshing: bool = False
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with TTL expiry and hot-entry refresh.
+
+    Entries that keep getting hit ("hot" queries) are refreshed in the
+    background once they pass half their TTL, so FAQ-style traffic is
+    always served from cache instead of occasionally paying a cold
+    re-compute when the entry expires.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 300,
+        max_entries: int = 256,
+        hot_threshold: int = 3,
+    ):
+        """
+        Initialize the query cache.
+
+        Args:
+            ttl_seconds: How long entries stay valid
+            max_entries: Maximum number of cached entries (LRU eviction)
+            hot_threshold: Hit count after which an aging entry is
+                           refreshed in the background
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hot_threshold = hot_threshold
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters for /stats
+        self.hits = 0
+        self.misses = 0
+        self.hot_refreshes = 0
+
+    def get(
+        self,
+        key: Hashable,
+        refresh: Optional[Callable[[], Any]] = None,
+    ) -> Optional[Any]:
+        """
+        Get a cached value, triggering a background refresh for hot entries.
+
+        Args:
+            key: Cache key
+            refresh: Optional zero-arg callable that recomputes the value;
+                     used to refresh hot entries past half their TTL
+
+        Returns:
+            Cached value or None on miss/expiry
+        """
+        needs_refresh = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            age = time.time() - entry.created_at
+            if age >= self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            entry.hits += 1
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+            if (
+                refresh is not None
+                and entry.hits >= self.hot_threshold
+                and age > self.ttl_seconds / 2
+                and not entry.refreshing
+            ):
+                entry.refreshing = True
+                self.hot_refreshes += 1
+                needs_refresh = True
+
+            value = entry.value
+
+        if needs_refresh:
+            thread = threading.Thread(
+                target=self._refresh, args=(key, refresh), daemon=True
+            )
+            thread.start()
+
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = CacheEntry(value=value, created_at=time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key: Hashable, refresh: Callable[[], Any]):
+        """Recompute a hot entry in the background and replace it."""
+        try:
+            value = refresh()
+        except Exception:
+            # Refresh is best-effort; clear the flag so a later hit retries
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+        else:
+            self.put(key, value)
+
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for tuning.
+
+        Returns:
+            Dictionary with entry count, hit rate, and refresh counters
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "hot_refreshes": self.hot_refreshes,
+            }
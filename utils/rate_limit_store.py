@@ -5,12 +5,17 @@ This module provides a thread-safe SQLite-backed store for tracking API calls
 and their token usage over time, enabling accurate rate limit enforcement.
 """
 
+import itertools
 import sqlite3
 import time
 import threading
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 from pathlib import Path
 
+# Distinguishes the shared-cache URIs of in-memory stores; a plain id()
+# could be reused after garbage collection and alias a still-open DB
+_memory_db_counter = itertools.count()
+
 
 class RateLimitStore:
     """
@@ -20,33 +25,76 @@ class RateLimitStore:
     to enable accurate rate limit checking across application restarts.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, time_fn=time.time):
         """
         Initialize the rate limit store.
 
         Args:
             db_path: Path to SQLite database file (will be created if not exists)
+            time_fn: Clock returning the current epoch seconds; tests
+                     inject a controllable fake to advance the sliding
+                     window without real sleeps
         """
         self.db_path = Path(db_path)
-        self.lock = threading.Lock()
+        self._now = time_fn
+        # A plain :memory: database is private to one connection, which
+        # breaks the per-thread connection scheme below; a shared-cache
+        # URI gives every thread's connection the same in-memory data.
+        # The anchor connection keeps the database alive for the store's
+        # lifetime even if worker threads come and go.
+        self._memory_uri = None
+        self._memory_anchor = None
+        if str(db_path) == ":memory:":
+            self._memory_uri = (
+                f"file:rate_limit_{next(_memory_db_counter)}"
+                "?mode=memory&cache=shared"
+            )
+            self._memory_anchor = sqlite3.connect(self._memory_uri, uri=True)
+        # One connection per thread: SQLite serializes writers itself
+        # (WAL + busy_timeout), so concurrent callers don't funnel
+        # through a single Python lock or re-open the file per call
+        self._local = threading.local()
         self._init_db()
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get this thread's persistent connection, creating it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._memory_uri is not None:
+                conn = sqlite3.connect(self._memory_uri, uri=True)
+            else:
+                conn = sqlite3.connect(self.db_path)
+            # WAL lets readers proceed during writes and NORMAL syncs in
+            # WAL mode cut an fsync per recorded call
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
     def _init_db(self):
         """Create database schema if it doesn't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS api_calls (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp REAL NOT NULL,
-                    tokens_used INTEGER NOT NULL,
-                    call_type TEXT NOT NULL
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_timestamp
-                ON api_calls(timestamp)
-            """)
-            conn.commit()
+        conn = self._get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS api_calls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp REAL NOT NULL,
+                tokens_used INTEGER NOT NULL,
+                call_type TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_timestamp
+            ON api_calls(timestamp)
+        """)
+        # Covering index for the token sum: the window queries read only
+        # (timestamp, tokens_used), so they never touch the table
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_timestamp_tokens
+            ON api_calls(timestamp, tokens_used)
+        """)
+        conn.commit()
 
     def record_call(self, tokens_used: int, call_type: str):
         """
@@ -56,14 +104,38 @@ class RateLimitStore:
             tokens_used: Number of tokens consumed by this call
             call_type: Type of API call (e.g., 'embed', 'generate')
         """
-        with self.lock:
-            timestamp = time.time()
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    "INSERT INTO api_calls (timestamp, tokens_used, call_type) VALUES (?, ?, ?)",
-                    (timestamp, tokens_used, call_type)
-                )
-                conn.commit()
+        timestamp = self._now()
+        conn = self._get_connection()
+        conn.execute(
+            "INSERT INTO api_calls (timestamp, tokens_used, call_type) VALUES (?, ?, ?)",
+            (timestamp, tokens_used, call_type)
+        )
+        conn.commit()
+
+    def record_calls(self, calls: Iterable[Tuple[int, str]]):
+        """
+        Record several API calls in one transaction.
+
+        One BEGIN IMMEDIATE + executemany + COMMIT costs a single fsync
+        regardless of how many calls are recorded, where looping over
+        record_call pays one per insert; executemany also parses and
+        prepares the INSERT statement once for the whole batch.
+
+        Args:
+            calls: Iterable of (tokens_used, call_type) pairs
+        """
+        timestamp = self._now()
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO api_calls (timestamp, tokens_used, call_type) VALUES (?, ?, ?)",
+                [(timestamp, tokens, call_type) for tokens, call_type in calls],
+            )
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
 
     def get_calls_in_window(self, window_seconds: int = 60) -> List[Tuple[float, int, str]]:
         """
@@ -75,14 +147,12 @@ class RateLimitStore:
         Returns:
             List of tuples: (timestamp, tokens_used, call_type)
         """
-        with self.lock:
-            cutoff_time = time.time() - window_seconds
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT timestamp, tokens_used, call_type FROM api_calls WHERE timestamp > ?",
-                    (cutoff_time,)
-                )
-                return cursor.fetchall()
+        cutoff_time = self._now() - window_seconds
+        cursor = self._get_connection().execute(
+            "SELECT timestamp, tokens_used, call_type FROM api_calls WHERE timestamp > ?",
+            (cutoff_time,)
+        )
+        return cursor.fetchall()
 
     def get_request_count_in_window(self, window_seconds: int = 60) -> int:
         """
@@ -94,8 +164,12 @@ class RateLimitStore:
         Returns:
             Number of requests in the window
         """
-        calls = self.get_calls_in_window(window_seconds)
-        return len(calls)
+        cutoff_time = self._now() - window_seconds
+        row = self._get_connection().execute(
+            "SELECT COUNT(*) FROM api_calls WHERE timestamp > ?",
+            (cutoff_time,)
+        ).fetchone()
+        return row[0]
 
     def get_token_count_in_window(self, window_seconds: int = 60) -> int:
         """
@@ -107,8 +181,12 @@ class RateLimitStore:
         Returns:
             Total tokens used in the window
         """
-        calls = self.get_calls_in_window(window_seconds)
-        return sum(tokens for _, tokens, _ in calls)
+        cutoff_time = self._now() - window_seconds
+        row = self._get_connection().execute(
+            "SELECT COALESCE(SUM(tokens_used), 0) FROM api_calls WHERE timestamp > ?",
+            (cutoff_time,)
+        ).fetchone()
+        return row[0]
 
     def cleanup_old_records(self, keep_seconds: int = 86400):
         """
@@ -117,11 +195,10 @@ class RateLimitStore:
         Args:
             keep_seconds: Keep records newer than this (default: 86400 = 24 hours)
         """
-        with self.lock:
-            cutoff_time = time.time() - keep_seconds
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM api_calls WHERE timestamp < ?", (cutoff_time,))
-                conn.commit()
+        cutoff_time = self._now() - keep_seconds
+        conn = self._get_connection()
+        conn.execute("DELETE FROM api_calls WHERE timestamp < ?", (cutoff_time,))
+        conn.commit()
 
     def get_oldest_call_timestamp(self, window_seconds: int = 60) -> float | None:
         """
@@ -0,0 +1,131 @@
+"""On-disk cache of retrieval results keyed by quantized query embedding."""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+import orjson
+
+
+class RetrievalCache:
+    """
+    Cache of top-k search results keyed by the query embedding.
+
+    Where SemanticCache stores finished answers in memory for one
+    process, this stores the retrieved chunk set on disk, so repeated or
+    near-identical questions across script runs skip the vector search
+    and only pay for generation. The embedding is quantized to int8
+    before hashing: two embeddings of the same (or a trivially
+    reformatted) question land on the same key, while genuinely
+    different questions do not.
+
+    Only valid while the corpus is stable — entries expire after a TTL
+    and the table is bounded, so stale results age out quickly.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "./.retrieval_cache.sqlite",
+        ttl_seconds: int = 3600,
+        max_entries: int = 1024,
+    ):
+        """
+        Initialize the retrieval cache.
+
+        Args:
+            db_path: Path to the SQLite cache file
+            ttl_seconds: How long entries stay valid
+            max_entries: Maximum number of cached entries
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS retrievals "
+                "(key TEXT PRIMARY KEY, results BLOB, ts REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def _key(
+        embedding: List[float],
+        top_k: int,
+        tags: Optional[List[str]],
+        section_path: Optional[str],
+    ) -> str:
+        """Hash the int8-quantized embedding together with the filters."""
+        quantized = bytes(
+            (max(-127, min(127, round(x * 127)))) & 0xFF for x in embedding
+        )
+        params = f"|{top_k}|{sorted(tags) if tags else []}|{section_path}"
+        return hashlib.blake2b(quantized + params.encode()).hexdigest()
+
+    def get(
+        self,
+        embedding: List[float],
+        top_k: int,
+        tags: Optional[List[str]] = None,
+        section_path: Optional[str] = None,
+    ) -> Optional[List[dict]]:
+        """
+        Look up cached search results for this embedding and filters.
+
+        Args:
+            embedding: Query embedding
+            top_k: Number of results originally requested
+            tags: Optional tag filter used in the search
+            section_path: Optional section path filter used in the search
+
+        Returns:
+            The cached result list, or None on miss/expiry
+        """
+        key = self._key(embedding, top_k, tags, section_path)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT results, ts FROM retrievals WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return orjson.loads(row[0])
+
+    def put(
+        self,
+        embedding: List[float],
+        top_k: int,
+        results: List[dict],
+        tags: Optional[List[str]] = None,
+        section_path: Optional[str] = None,
+    ):
+        """
+        Store search results keyed by this embedding and filters.
+
+        Args:
+            embedding: Query embedding
+            top_k: Number of results originally requested
+            results: Search results as returned by the vector store
+            tags: Optional tag filter used in the search
+            section_path: Optional section path filter used in the search
+        """
+        key = self._key(embedding, top_k, tags, section_path)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO retrievals (key, results, ts) "
+                "VALUES (?, ?, ?)",
+                (key, orjson.dumps(results), time.time()),
+            )
+            # Keep the cache bounded: drop the oldest entries past the cap
+            conn.execute(
+                "DELETE FROM retrievals WHERE key IN ("
+                "SELECT key FROM retrievals ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        """Drop all cached retrievals (e.g. after re-ingesting the corpus)."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM retrievals")
@@ -0,0 +1,114 @@
+"""Semantic cache that reuses responses for near-identical queries."""
+
+import math
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+
+class SemanticCache:
+    """
+    Cache keyed by query embedding rather than query text.
+
+    Two phrasings of the same question embed to nearly the same vector,
+    so a cosine-similarity lookup against previously answered queries can
+    return the stored response without re-running retrieval and the LLM.
+    Entries expire after a TTL and the store is bounded (FIFO eviction).
+
+    The linear scan over cached embeddings is deliberate: at the cache
+    sizes used here (hundreds of entries) it is faster than maintaining
+    an ANN index and has no extra dependencies.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl_seconds: int = 300,
+        max_entries: int = 256,
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity to count as a hit
+            ttl_seconds: How long entries stay valid
+            max_entries: Maximum number of cached entries
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Parallel lists of (normalized embedding, response, created_at)
+        self._entries: List[Tuple[List[float], Any, float]] = []
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> List[float]:
+        """L2-normalize an embedding so dot product equals cosine similarity."""
+        norm = math.sqrt(sum(x * x for x in embedding))
+        if norm == 0:
+            return list(embedding)
+        return [x / norm for x in embedding]
+
+    def get(self, embedding: List[float]) -> Optional[Any]:
+        """
+        Look up a response for a semantically similar previous query.
+
+        Args:
+            embedding: Query embedding
+
+        Returns:
+            Cached response if a stored query is within the similarity
+            threshold, otherwise None
+        """
+        query = self._normalize(embedding)
+        now = time.time()
+
+        with self._lock:
+            # Drop expired entries up front
+            self._entries = [
+                entry for entry in self._entries
+                if now - entry[2] < self.ttl_seconds
+            ]
+
+            best_sim = 0.0
+            best_response = None
+            for stored, response, _ in self._entries:
+                sim = sum(a * b for a, b in zip(query, stored))
+                if sim > best_sim:
+                    best_sim = sim
+                    best_response = response
+
+            if best_sim >= self.threshold:
+                self.hits += 1
+                return best_response
+
+            self.misses += 1
+            return None
+
+    def put(self, embedding: List[float], response: Any):
+        """
+        Store a response keyed by its query embedding.
+
+        Args:
+            embedding: Query embedding
+            response: Response to cache
+        """
+        entry = (self._normalize(embedding), response, time.time())
+        with self._lock:
+            self._entries.append(entry)
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(0)
+
+    def get_stats(self) -> dict:
+        """Get hit/miss counters for tuning the threshold."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
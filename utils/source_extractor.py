@@ -1,16 +1,64 @@
 """Extract Python source code definitions from files."""
 
 import ast
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, List
 
 
+@dataclass
+class _CachedFile:
+    """Cached source file content with a lazily parsed AST."""
+
+    stamp: tuple[float, int]  # (mtime, size) for revalidation
+    source: str
+    lines: list[str]
+    tree: Optional[ast.AST] = None
+
+
 class SourceCodeExtractor:
     """Extract function and class definitions from Python source files."""
 
     def __init__(self):
         """Initialize the source code extractor."""
-        pass
+        # File-content cache keyed by path and revalidated on mtime/size,
+        # so repeat extractions against the same files skip disk reads
+        self._file_cache: dict[str, _CachedFile] = {}
+
+    def _read_source(self, file_path: Path) -> _CachedFile:
+        """
+        Read a source file, reusing cached content while it is unchanged.
+
+        Args:
+            file_path: Path to the Python source file
+
+        Returns:
+            Cached file entry with source text and lines
+        """
+        key = str(file_path)
+        stat = file_path.stat()
+        stamp = (stat.st_mtime, stat.st_size)
+
+        cached = self._file_cache.get(key)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            source_code = f.read()
+        entry = _CachedFile(stamp=stamp, source=source_code, lines=source_code.splitlines())
+        self._file_cache[key] = entry
+        return entry
+
+    def _get_ast(self, entry: _CachedFile) -> ast.AST:
+        """
+        Parse the cached source once; later mode switches reuse the tree.
+
+        Raises:
+            SyntaxError: If the source cannot be parsed
+        """
+        if entry.tree is None:
+            entry.tree = ast.parse(entry.source)
+        return entry.tree
 
     def extract_at_line(
         self,
@@ -45,14 +93,13 @@ class SourceCodeExtractor:
             return None
 
         try:
-            # Read the entire file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-                lines = source_code.splitlines()
+            # Read the entire file (content and AST cached while unchanged)
+            entry = self._read_source(file_path)
+            lines = entry.lines
 
             # Try to parse with AST
             try:
-                tree = ast.parse(source_code)
+                tree = self._get_ast(entry)
                 result = self._extract_with_ast(tree, lines, line_number)
                 if result:
                     result['file_path'] = str(file_path)
@@ -221,13 +268,12 @@ class SourceCodeExtractor:
             return None
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-                lines = source_code.splitlines()
+            entry = self._read_source(file_path)
+            lines = entry.lines
 
             # Try AST parsing
             try:
-                tree = ast.parse(source_code)
+                tree = self._get_ast(entry)
                 node = self._find_node_at_line(tree, line_number)
                 if node:
                     signature = self._extract_signature_from_node(node, lines)
@@ -279,11 +325,10 @@ class SourceCodeExtractor:
             return None
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-                lines = source_code.splitlines()
+            entry = self._read_source(file_path)
+            lines = entry.lines
 
-            tree = ast.parse(source_code)
+            tree = self._get_ast(entry)
             node = self._find_node_at_line(tree, line_number)
 
             if node and isinstance(node, ast.ClassDef):
@@ -326,11 +371,10 @@ class SourceCodeExtractor:
             return None
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-                lines = source_code.splitlines()
+            entry = self._read_source(file_path)
+            lines = entry.lines
 
-            tree = ast.parse(source_code)
+            tree = self._get_ast(entry)
             node = self._find_node_at_line(tree, line_number)
 
             if node and isinstance(node, ast.ClassDef):
@@ -381,11 +425,10 @@ class SourceCodeExtractor:
             return None
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-                lines = source_code.splitlines()
+            entry = self._read_source(file_path)
+            lines = entry.lines
 
-            tree = ast.parse(source_code)
+            tree = self._get_ast(entry)
             class_node = self._find_node_at_line(tree, class_line)
 
             if class_node and isinstance(class_node, ast.ClassDef):